@@ -0,0 +1,228 @@
+"""
+Hot backup and restore of the SQLite database.
+
+Backups use SQLite's online backup API from a separate connection, copying
+BACKUP_PAGES_PER_STEP pages at a time with a short pause between steps, so
+requests keep reading and writing while a snapshot is taken. In WAL mode a
+write from another connection restarts the copy; after a few restarts the
+remaining copy is done in one step, which still only holds a read lock.
+
+Command line:
+    python -m app.backup backup [destination]
+    python -m app.backup restore <backup file>
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+
+from app.database import engine
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./database/backups")
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+# Pause between steps, giving request writes a chance to take the lock
+BACKUP_STEP_PAUSE = float(os.getenv("BACKUP_STEP_PAUSE", "0.005"))
+# Restarts tolerated before finishing the copy in a single step
+MAX_RESTARTS = 3
+
+
+class BackupError(Exception):
+    pass
+
+
+class _Restarted(Exception):
+    pass
+
+
+def database_path(bind=engine) -> str:
+    if bind.dialect.name != "sqlite" or not bind.url.database or bind.url.database == ":memory:":
+        raise BackupError("Online backup is only available for file-based SQLite databases")
+    return bind.url.database
+
+
+def backup_database(
+    source_path: str,
+    dest_path: str,
+    pages: int = BACKUP_PAGES_PER_STEP,
+    pause: float = BACKUP_STEP_PAUSE,
+    progress: Optional[Callable[[int, int], None]] = None,
+):
+    """
+    Copy a live database to `dest_path` with the online backup API.
+
+    Args:
+        source_path (str): Path of the database to back up
+        dest_path (str): Path of the snapshot to write
+        pages (int): Pages copied per step
+        pause (float): Seconds to sleep between steps
+        progress: Called with (remaining pages, total pages) after each step
+    """
+    restarts = 0
+    last_remaining = None
+
+    def on_step(status, remaining, total):
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _Restarted()
+        last_remaining = remaining
+        if progress:
+            progress(remaining, total)
+        if pause:
+            time.sleep(pause)
+
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    dest = sqlite3.connect(dest_path)
+    try:
+        try:
+            source.backup(dest, pages=pages, progress=on_step)
+        except _Restarted:
+            # Writes keep restarting the copy: finish it as one snapshot
+            source.backup(dest, pages=-1)
+            if progress:
+                progress(0, last_remaining or 0)
+    finally:
+        dest.close()
+        source.close()
+
+
+def restore_database(backup_path: str, dest_path: str, pages: int = BACKUP_PAGES_PER_STEP):
+    """
+    Overwrite a database with the contents of a backup.
+
+    Runs through the backup API, so it is safe with the server running;
+    open connections see the restored data on their next transaction.
+    """
+    if not os.path.exists(backup_path):
+        raise BackupError(f"Backup file not found: {backup_path}")
+    source = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+    dest = sqlite3.connect(dest_path)
+    try:
+        source.backup(dest, pages=pages)
+    finally:
+        dest.close()
+        source.close()
+
+
+@dataclass
+class BackupJob:
+    id: str
+    path: str
+    status: str = "pending"
+    pages_total: int = 0
+    pages_remaining: int = 0
+    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    finished_at: Optional[str] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def progress(self) -> float:
+        if self.status == "completed":
+            return 1.0
+        if not self.pages_total:
+            return 0.0
+        return round(1 - self.pages_remaining / self.pages_total, 4)
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "progress": self.progress}
+
+
+class BackupManager:
+    """Runs one backup at a time on a background thread and tracks its progress."""
+
+    def __init__(self, backup_dir: str = BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self._jobs: Dict[str, BackupJob] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> BackupJob:
+        source_path = database_path()
+        with self._lock:
+            if any(job.status in ("pending", "running") for job in self._jobs.values()):
+                raise BackupError("A backup is already running")
+            os.makedirs(self.backup_dir, exist_ok=True)
+            job_id = uuid.uuid4().hex
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+            job = BackupJob(id=job_id, path=os.path.join(self.backup_dir, f"items-{stamp}-{job_id[:8]}.db"))
+            self._jobs[job_id] = job
+
+        threading.Thread(target=self._run, args=(job, source_path), daemon=True).start()
+        return job
+
+    def _run(self, job: BackupJob, source_path: str):
+        def progress(remaining, total):
+            job.pages_remaining, job.pages_total = remaining, total
+
+        job.status = "running"
+        try:
+            backup_database(source_path, job.path, progress=progress)
+            job.size = os.path.getsize(job.path)
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+
+    def get(self, job_id: str) -> Optional[BackupJob]:
+        return self._jobs.get(job_id)
+
+
+backups = BackupManager()
+
+
+def iter_file(path: str, compress: bool = False, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Read a file in chunks, optionally gzip-compressing it on the fly."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if compressor:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up or restore the items database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backup_cmd = commands.add_parser("backup", help="Take a hot snapshot of the database")
+    backup_cmd.add_argument("destination", nargs="?", help="Snapshot path (default: BACKUP_DIR)")
+    restore_cmd = commands.add_parser("restore", help="Replace the database with a snapshot")
+    restore_cmd.add_argument("source", help="Snapshot to restore")
+    args = parser.parse_args(argv)
+
+    path = database_path()
+    if args.command == "backup":
+        destination = args.destination
+        if destination is None:
+            os.makedirs(BACKUP_DIR, exist_ok=True)
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+            destination = os.path.join(BACKUP_DIR, f"items-{stamp}.db")
+
+        def progress(remaining, total):
+            print(f"\r{total - remaining}/{total} pages", end="", flush=True)
+
+        backup_database(path, destination, progress=progress)
+        print(f"\nBackup written to {destination}")
+    else:
+        restore_database(args.source, path)
+        print(f"Restored {path} from {args.source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+In-memory documents served with ETags.
+
+Pages that do not change while the process runs (the rendered index page,
+the OpenAPI schema and the docs pages) are built once at startup and served
+from memory. Clients that send a matching If-None-Match get 304 Not
+Modified without a body.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+class CachedDocument:
+    """A response body built once, with a strong ETag derived from its content."""
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = "no-cache"):
+        self.body = body
+        self.media_type = media_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        # no-cache: browsers keep the copy but revalidate it with the ETag
+        self.headers = {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def response(self, request: Request) -> Response:
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type=self.media_type, headers=self.headers)
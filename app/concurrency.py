@@ -0,0 +1,101 @@
+"""
+Threadpool sizing and per-class offloading of blocking work.
+
+Sync route handlers and dependencies share AnyIO's default capacity limiter
+(THREADPOOL_SIZE threads). Database work from the item routes is offloaded
+through two separately bounded executors instead: `point_executor` for
+single-item reads and writes, and `scan_executor` for list and batch reads,
+so a burst of expensive scans cannot take every thread from cheap point
+operations, and the other way round.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+import anyio
+import anyio.to_thread
+
+T = TypeVar("T")
+
+# Threads in AnyIO's default limiter (sync routes, dependencies, maintenance)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+# Concurrent point operations (get/create/update/delete one item)
+POINT_THREADS = int(os.getenv("POINT_THREADS", "24"))
+# Concurrent scans (list pages, batch reads, exports)
+SCAN_THREADS = int(os.getenv("SCAN_THREADS", "6"))
+
+
+class BoundedExecutor:
+    """Runs blocking calls in worker threads, at most `limit` at a time."""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        # Capacity limiters belong to an event loop; created on first use
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.completed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _get_limiter(self) -> anyio.CapacityLimiter:
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._loop is not loop:
+            self._limiter = anyio.CapacityLimiter(self.limit)
+            self._loop = loop
+        return self._limiter
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call `func(*args, **kwargs)` in a worker thread once a slot is free."""
+        submitted = time.perf_counter()
+        started = submitted
+
+        def call():
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args, **kwargs)
+
+        try:
+            return await anyio.to_thread.run_sync(call, limiter=self._get_limiter())
+        finally:
+            wait = started - submitted
+            self.completed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def statistics(self) -> dict:
+        stats = self._limiter.statistics() if self._limiter is not None else None
+        return {
+            "limit": self.limit,
+            "running": stats.borrowed_tokens if stats else 0,
+            "queued": stats.tasks_waiting if stats else 0,
+            "completed": self.completed,
+            "wait_avg_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+point_executor = BoundedExecutor("point", POINT_THREADS)
+scan_executor = BoundedExecutor("scan", SCAN_THREADS)
+
+
+def configure_threadpool(size: int = THREADPOOL_SIZE):
+    """Resize AnyIO's default limiter; must be called on the running event loop."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def threadpool_statistics() -> Dict[str, dict]:
+    """Occupancy, queue depth and queueing delay of each executor."""
+    stats = {executor.name: executor.statistics() for executor in (point_executor, scan_executor)}
+    try:
+        default = anyio.to_thread.current_default_thread_limiter().statistics()
+        stats["default"] = {
+            "limit": int(default.total_tokens),
+            "running": default.borrowed_tokens,
+            "queued": default.tasks_waiting,
+        }
+    except RuntimeError:
+        pass  # No event loop (called outside the application)
+    return stats
@@ -5,14 +5,18 @@ This module imports and exposes all CRUD operations from their respective module
 
 # Import operations
 from app.crud.create import create_item
-from app.crud.read import get_item, get_items
-from app.crud.update import update_item
-from app.crud.delete import delete_item
+from app.crud.read import get_item, get_items, get_items_by_ids
+from app.crud.update import update_item, VersionConflict
+from app.crud.delete import delete_item, restore_item, purge_deleted_items
+from app.crud.archive import archive_completed_items, unarchive_item
+from app.crud.summary import get_summary, reconcile_summary, rebuild_summary
 
 # Re-export all operations
 __all__ = [
     "create_item",  # Create operations
-    "get_item", "get_items",  # Read operations
-    "update_item",  # Update operations
-    "delete_item",  # Delete operations
+    "get_item", "get_items", "get_items_by_ids",  # Read operations
+    "update_item", "VersionConflict",  # Update operations
+    "delete_item", "restore_item", "purge_deleted_items",  # Delete operations
+    "archive_completed_items", "unarchive_item",  # Archive operations
+    "get_summary", "reconcile_summary", "rebuild_summary",  # Summary operations
 ]
\ No newline at end of file
@@ -0,0 +1,74 @@
+from datetime import datetime
+from sqlalchemy import DateTime, insert, literal, or_, select
+from sqlalchemy.orm import Session
+from app.models.item import ArchivedItem, Item
+
+# Columns copied between `items` and `items_archive`; rows keep their tenant both ways
+ARCHIVED_COLUMNS = ("id", "tenant_id", "title", "description", "completed", "updated_at", "version")
+
+
+def ids_are_never_reused(db: Session) -> bool:
+    """
+    Whether new items can never get the id of an archived one.
+
+    SQLite reuses the highest rowid once that row leaves the table unless the
+    table was created with AUTOINCREMENT. migrate_schema rebuilds older
+    tables with it; this guards against databases it has not migrated.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return True
+    sql = db.connection().exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (Item.__tablename__,)
+    ).scalar()
+    return bool(sql) and "AUTOINCREMENT" in sql.upper()
+
+
+def archive_completed_items(db: Session, completed_before: datetime, batch_size: int = 500) -> int:
+    """
+    Move one batch of completed items last changed before a cutoff to the archive.
+
+    Args:
+        db (Session): Database session
+        completed_before (datetime): Only archive items not updated since this time
+        batch_size (int): Maximum number of rows to move in this transaction
+
+    Returns:
+        int: Number of rows archived
+    """
+    archivable = (
+        Item.completed == True,  # noqa: E712 - matches the partial index predicate
+        Item.deleted_at.is_(None),
+        or_(Item.updated_at < completed_before, Item.updated_at.is_(None)),
+    )
+    ids = [row.id for row in db.query(Item.id).filter(*archivable).order_by(Item.updated_at).limit(batch_size)]
+    if not ids:
+        return 0
+
+    columns = [getattr(Item, name) for name in ARCHIVED_COLUMNS]
+    # Re-check the conditions in case an item changed since it was selected
+    moved = select(*columns, literal(datetime.utcnow(), DateTime)).where(Item.id.in_(ids), *archivable)
+    db.execute(insert(ArchivedItem).from_select([*ARCHIVED_COLUMNS, "archived_at"], moved))
+    db.query(Item).filter(
+        Item.id.in_(select(ArchivedItem.id).where(ArchivedItem.id.in_(ids)))
+    ).delete(synchronize_session=False)
+    db.commit()
+    return len(ids)
+
+
+def unarchive_item(db: Session, item_id: int) -> bool:
+    """
+    Move an archived item back to `items` so it can be changed.
+
+    Does not commit; the caller's update or delete commits both steps together.
+
+    Returns:
+        bool: True if the item was in the archive
+    """
+    columns = [getattr(ArchivedItem, name) for name in ARCHIVED_COLUMNS]
+    moved = db.execute(
+        insert(Item).from_select(list(ARCHIVED_COLUMNS), select(*columns).where(ArchivedItem.id == item_id))
+    ).rowcount
+    if not moved:
+        return False
+    db.query(ArchivedItem).filter(ArchivedItem.id == item_id).delete(synchronize_session=False)
+    return True
@@ -1,12 +1,22 @@
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
 from app.models.item import Item
 from app.schemas.item import ItemCreate
+from app.events import publish_item
+from app.crud.summary import apply_summary_delta
 
-def create_item(db: Session, item: ItemCreate):
+def create_item(db: Session, item: ItemCreate, before_commit: Optional[Callable[[Item], None]] = None):
     db_item = Item(title=item.title,description=item.description,completed=item.completed)
     db.add(db_item)
+    apply_summary_delta(db, None, (item.title, item.completed))
+    if before_commit is not None:
+        # Lets the caller write in the same transaction, e.g. the stored
+        # response of an idempotent request; the row has its id by then
+        db.flush()
+        before_commit(db_item)
+    # The INSERT assigns the id and fills in the defaults; nothing needs reloading
     db.commit()
-    db.refresh(db_item)
+    publish_item("create", db_item)
     return db_item
     """
     Create a new item in the database.
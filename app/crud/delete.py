@@ -1,31 +1,54 @@
+import os
+from datetime import datetime
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.models.item import Item
+from app.events import publish, publish_item
+from app.crud.archive import unarchive_item
+from app.crud.summary import apply_summary_delta
 
+# Keep deleted items as tombstones (deleted_at set) that can be restored until
+# the background purge removes them
+SOFT_DELETE = os.getenv("SOFT_DELETE", "0") == "1"
 
-def delete_item(db: Session, item_id: int) -> bool:
+
+def delete_item(db: Session, item_id: int, soft: bool = SOFT_DELETE) -> bool:
     """
     Delete an item from the database.
     
     Args:
         db (Session): Database session
         item_id (int): ID of the item to delete
+        soft (bool): Mark the item deleted instead of removing the row
         
     Returns:
         bool: True if the item was deleted, False if the item was not found
     """
  
-    item = db.query(Item).filter(Item.id == item_id).first()
+    # Claim the row first so a concurrent delete cannot also count it out
+    # of the summary; the claim holds the write lock until commit
+    claimed = db.query(Item).filter(Item.id == item_id, Item.deleted_at.is_(None)).update(
+        {"updated_at": datetime.utcnow(), "version": Item.version + 1}, synchronize_session=False
+    )
+    # Archived items are deleted (or tombstoned) from the live table
+    claimed = claimed or unarchive_item(db, item_id)
     
    
-    if not item:
+    if not claimed:
         return False
 
    
-    db.delete(item)
+    item = db.query(Item).filter(Item.id == item_id).first()
+    tenant = item.tenant_id
+    apply_summary_delta(db, (item.title, item.completed), None)
+    if soft:
+        item.deleted_at = datetime.utcnow()
+    else:
+        db.delete(item)
 
  
     db.commit()
+    publish("delete", {"id": item_id}, tenant)
 
   
     return True 
@@ -44,5 +67,53 @@ def delete_item(db: Session, item_id: int) -> bool:
     # 5. Return True to indicate successful deletion
     
     # Delete the code below and implement your solution
-    
-  
\ No newline at end of file
+
+
+def restore_item(db: Session, item_id: int) -> Optional[Item]:
+    """
+    Undo a soft delete.
+
+    Args:
+        db (Session): Database session
+        item_id (int): ID of the soft-deleted item
+
+    Returns:
+        Optional[Item]: The restored item or None if there is no tombstone for it
+    """
+    restored = db.query(Item).filter(Item.id == item_id, Item.deleted_at.isnot(None)).update(
+        {"deleted_at": None, "version": Item.version + 1}, synchronize_session=False
+    )
+    if not restored:
+        return None
+    item = db.query(Item).filter(Item.id == item_id).first()
+    apply_summary_delta(db, None, (item.title, item.completed))
+    db.commit()
+    db.refresh(item)
+    publish_item("create", item)
+    return item
+
+
+def purge_deleted_items(db: Session, deleted_before: datetime, batch_size: int = 500) -> int:
+    """
+    Hard-delete one batch of tombstones older than a cutoff.
+
+    Args:
+        db (Session): Database session
+        deleted_before (datetime): Only purge items soft-deleted before this time
+        batch_size (int): Maximum number of rows to delete in this transaction
+
+    Returns:
+        int: Number of rows purged
+    """
+    ids = [
+        row.id
+        for row in db.query(Item.id)
+        .filter(Item.deleted_at.isnot(None), Item.deleted_at < deleted_before)
+        .order_by(Item.deleted_at)
+        .limit(batch_size)
+    ]
+    if not ids:
+        return 0
+    db.query(Item).filter(Item.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(ids)
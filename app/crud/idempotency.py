@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+
+
+def get_idempotency_key(db: Session, key: str, ttl: float) -> Optional[IdempotencyKey]:
+    """
+    Get a stored idempotency key that has not expired.
+
+    Args:
+        db (Session): Database session
+        key (str): The client's Idempotency-Key
+        ttl (float): Seconds a key stays valid
+
+    Returns:
+        Optional[IdempotencyKey]: The stored key or None if absent or expired
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+    return (
+        db.query(IdempotencyKey)
+        .filter(IdempotencyKey.key == key, IdempotencyKey.created_at > cutoff)
+        .first()
+    )
+
+
+def reserve_idempotency_key(db: Session, key: str, request_hash: str) -> bool:
+    """
+    Insert a pending record for a key, committing immediately.
+
+    Returns:
+        bool: True if the key was reserved, False if a record already exists
+    """
+    db.add(IdempotencyKey(key=key, request_hash=request_hash, created_at=datetime.utcnow()))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def complete_idempotency_key(
+    db: Session, key: str, status_code: int, response_body: str, etag: Optional[str] = None
+):
+    """
+    Store the response of the request that reserved the key.
+
+    Does not commit; the caller commits it together with the write it
+    answers, so a stored item never has a pending key.
+    """
+    db.query(IdempotencyKey).filter(IdempotencyKey.key == key).update(
+        {"status_code": status_code, "response_body": response_body, "etag": etag}
+    )
+
+
+def delete_idempotency_key(db: Session, key: str):
+    """Drop a key, e.g. a reservation whose request failed."""
+    db.query(IdempotencyKey).filter(IdempotencyKey.key == key).delete()
+    db.commit()
+
+
+def purge_expired_idempotency_keys(db: Session, ttl: float) -> int:
+    """
+    Delete keys older than the TTL.
+
+    Returns:
+        int: Number of keys deleted
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+    deleted = db.query(IdempotencyKey).filter(IdempotencyKey.created_at <= cutoff).delete()
+    db.commit()
+    return deleted
@@ -1,10 +1,107 @@
+from sqlalchemy import select, union_all
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.models.item import Item
+from typing import List, Optional, Union
+from app.models.item import ArchivedItem, Item
 
-def get_item(db: Session, item_id: int) -> Optional[Item]:
-    return db.query(Item).filter(Item.id == item_id).first()
+def get_item(db: Session, item_id: int) -> Optional[Union[Item, ArchivedItem]]:
+    item = db.query(Item).filter(Item.id == item_id, Item.deleted_at.is_(None)).first()
+    if item is None:
+        # Completed items eventually move to the archive
+        item = db.query(ArchivedItem).filter(ArchivedItem.id == item_id).first()
+    return item
 
-def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
-    item_list = db.query(Item).offset(skip).limit(limit).all()
-    return item_list
\ No newline at end of file
+def get_items(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    include_archived: bool = False,
+    after_id: Optional[int] = None,
+) -> List[Item]:
+    """
+    One page of items in id order.
+
+    `after_id` continues from the last id of the previous page (keyset
+    pagination): it seeks straight to the page in the tenant's id index
+    and, unlike `skip`, does not shift when earlier rows are deleted.
+    """
+    if include_archived:
+        return _get_items_with_archive(db, skip, limit, after_id)
+    query = db.query(Item).filter(Item.deleted_at.is_(None))
+    if after_id is not None:
+        query = query.filter(Item.id > after_id)
+    item_list = query.order_by(Item.id).offset(skip).limit(limit).all()
+    return item_list
+
+def _get_items_with_archive(db: Session, skip: int, limit: int, after_id: Optional[int] = None):
+    """One page of live and archived items merged in id order."""
+    def page(model, *criteria):
+        if after_id is not None:
+            criteria += (model.id > after_id,)
+        # Neither side can contribute more than skip + limit rows to the page
+        columns = select(model.id, model.title, model.description, model.completed, model.version)
+        return columns.where(*criteria).order_by(model.id).limit(skip + limit).subquery().select()
+
+    merged = union_all(page(Item, Item.deleted_at.is_(None)), page(ArchivedItem)).subquery()
+    return db.execute(select(merged).order_by(merged.c.id).offset(skip).limit(limit)).all()
+
+# Columns a bulk export may select
+EXPORT_FIELDS = ("id", "title", "description", "completed")
+
+def select_items(fields: List[str], skip: int = 0, limit: Optional[int] = None, include_archived: bool = False):
+    """
+    Core SELECT of some item columns in id order, for streaming exports.
+
+    Args:
+        fields (List[str]): Columns to return, from EXPORT_FIELDS
+        skip (int): Rows to skip
+        limit (Optional[int]): Maximum number of rows, None for all
+        include_archived (bool): Also return archived items
+
+    Returns:
+        Select: Statement returning one row per item with the requested columns
+    """
+    if include_archived:
+        # The merged rows are ordered by id, so it is selected even if not requested
+        inner = list(dict.fromkeys(["id", *fields]))
+        rows = union_all(
+            select(*[getattr(Item, name) for name in inner]).where(Item.deleted_at.is_(None)),
+            select(*[getattr(ArchivedItem, name) for name in inner]),
+        ).subquery()
+        statement = select(*[rows.c[name] for name in fields]).order_by(rows.c.id)
+    else:
+        statement = (
+            select(*[getattr(Item, name) for name in fields])
+            .where(Item.deleted_at.is_(None))
+            .order_by(Item.id)
+        )
+    if skip:
+        statement = statement.offset(skip)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+# Stay well below SQLite's bound-parameter limit (999 on older builds)
+MAX_IN_CLAUSE_PARAMS = 900
+
+def get_items_by_ids(db: Session, item_ids: List[int]) -> List[Optional[Item]]:
+    """
+    Get many items by ID with one IN query per chunk of ids.
+
+    Ids missing from `items` are looked up in the archive the same way.
+
+    Args:
+        db (Session): Database session
+        item_ids (List[int]): IDs to fetch, in the order results are wanted
+
+    Returns:
+        List[Optional[Item]]: One entry per requested id, None where not found
+    """
+    unique_ids = list(dict.fromkeys(item_ids))
+    found = {}
+    for model, criteria in ((Item, (Item.deleted_at.is_(None),)), (ArchivedItem, ())):
+        missing = [item_id for item_id in unique_ids if item_id not in found]
+        for start in range(0, len(missing), MAX_IN_CLAUSE_PARAMS):
+            chunk = missing[start:start + MAX_IN_CLAUSE_PARAMS]
+            for item in db.query(model).filter(model.id.in_(chunk), *criteria):
+                found[item.id] = item
+    return [found.get(item_id) for item_id in item_ids]
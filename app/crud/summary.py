@@ -0,0 +1,170 @@
+import logging
+import os
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import Integer, case, func, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.item import ArchivedItem, Item
+from app.models.summary import ItemSummary
+from app.tenancy import DEFAULT_TENANT, session_tenant
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated title prefixes counted separately, e.g. "Bug:,Feature:"
+SUMMARY_PREFIXES = [prefix.strip() for prefix in os.getenv("SUMMARY_PREFIXES", "").split(",") if prefix.strip()]
+
+TOTAL_BUCKET = "*"
+
+# (title, completed) of an item before or after a change; None if it did not count
+ItemState = Optional[Tuple[Optional[str], Optional[bool]]]
+Counts = Tuple[int, int]
+# (tenant, bucket) of a stored or recounted row
+SummaryKey = Tuple[str, str]
+
+
+def prefix_bucket(prefix: str) -> str:
+    return f"prefix:{prefix}"
+
+
+def _buckets(title: Optional[str], prefixes: Iterable[str]) -> list:
+    return [TOTAL_BUCKET] + [prefix_bucket(p) for p in prefixes if title and title.startswith(p)]
+
+
+def apply_summary_delta(db: Session, before: ItemState, after: ItemState, prefixes: Iterable[str] = None):
+    """
+    Adjust the summary for one item changing from `before` to `after`.
+
+    Runs in the caller's transaction, so the counts commit or roll back
+    together with the item itself. Live and archived items are counted;
+    soft-deleted ones are not. The counts are those of the session's tenant.
+    """
+    prefixes = SUMMARY_PREFIXES if prefixes is None else prefixes
+    tenant = session_tenant(db) or DEFAULT_TENANT
+    deltas: Dict[str, list] = {}
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        title, completed = state
+        for bucket in _buckets(title, prefixes):
+            delta = deltas.setdefault(bucket, [0, 0])
+            delta[0] += sign
+            delta[1] += sign if completed else 0
+
+    dialect = db.get_bind().dialect.name
+    for bucket, (total, completed) in deltas.items():
+        if not total and not completed:
+            continue
+        if dialect in ("sqlite", "postgresql"):
+            insert = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(ItemSummary)
+            db.execute(
+                insert.values(
+                    tenant_id=tenant, bucket=bucket, total=total, completed=completed
+                ).on_conflict_do_update(
+                    index_elements=[ItemSummary.tenant_id, ItemSummary.bucket],
+                    set_={
+                        "total": ItemSummary.total + total,
+                        "completed": ItemSummary.completed + completed,
+                    },
+                )
+            )
+        else:
+            row = db.query(ItemSummary).filter(ItemSummary.tenant_id == tenant, ItemSummary.bucket == bucket)
+            updated = row.update(
+                {"total": ItemSummary.total + total, "completed": ItemSummary.completed + completed},
+                synchronize_session=False,
+            )
+            if not updated:
+                db.add(ItemSummary(tenant_id=tenant, bucket=bucket, total=total, completed=completed))
+
+
+def get_summary(db: Session, prefixes: Iterable[str] = None) -> Dict[str, Counts]:
+    """
+    Read the stored counts of the session's tenant.
+
+    Returns:
+        Dict[str, Counts]: (total, completed) per bucket, zero for buckets with no row
+    """
+    prefixes = SUMMARY_PREFIXES if prefixes is None else prefixes
+    wanted = [TOTAL_BUCKET] + [prefix_bucket(p) for p in prefixes]
+    stored = {
+        row.bucket: (row.total, row.completed)
+        for row in db.query(ItemSummary).filter(
+            ItemSummary.tenant_id == (session_tenant(db) or DEFAULT_TENANT), ItemSummary.bucket.in_(wanted)
+        )
+    }
+    return {bucket: stored.get(bucket, (0, 0)) for bucket in wanted}
+
+
+def count_summary(db: Session, prefixes: Iterable[str] = None) -> Dict[SummaryKey, Counts]:
+    """Recount every tenant's buckets from the items and archive tables (a full scan)."""
+    prefixes = SUMMARY_PREFIXES if prefixes is None else list(prefixes)
+    rows = union_all(
+        select(Item.tenant_id, Item.title, Item.completed).where(Item.deleted_at.is_(None)),
+        select(ArchivedItem.tenant_id, ArchivedItem.title, ArchivedItem.completed),
+    ).subquery()
+    completed = func.coalesce(rows.c.completed, False).cast(Integer)
+    columns = [rows.c.tenant_id, func.count(), func.coalesce(func.sum(completed), 0)]
+    for prefix in prefixes:
+        matches = func.substr(rows.c.title, 1, len(prefix)) == prefix
+        columns.append(func.coalesce(func.sum(case((matches, 1), else_=0)), 0))
+        columns.append(func.coalesce(func.sum(case((matches, completed), else_=0)), 0))
+    counts = {}
+    for values in db.execute(select(*columns).group_by(rows.c.tenant_id)):
+        tenant = values[0]
+        counts[(tenant, TOTAL_BUCKET)] = (values[1], values[2])
+        for n, prefix in enumerate(prefixes):
+            counts[(tenant, prefix_bucket(prefix))] = (values[3 + 2 * n], values[4 + 2 * n])
+    return counts
+
+
+def _nonzero(counts: Dict[SummaryKey, Counts]) -> Dict[SummaryKey, Counts]:
+    # A bucket without a row reads as zero, so zero rows carry no information
+    return {key: value for key, value in counts.items() if value != (0, 0)}
+
+
+def _lock_for_recount(db: Session):
+    # Keep writers out between the recount and overwriting the stored counts
+    if db.get_bind().dialect.name == "sqlite":
+        db.rollback()
+        db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        db.query(ItemSummary).with_for_update().all()
+
+
+def rebuild_summary(db: Session, prefixes: Iterable[str] = None) -> Dict[SummaryKey, Counts]:
+    """Replace the stored counts with a fresh recount, blocking writes while it runs."""
+    prefixes = SUMMARY_PREFIXES if prefixes is None else list(prefixes)
+    _lock_for_recount(db)
+    counts = count_summary(db, prefixes)
+    db.query(ItemSummary).delete(synchronize_session=False)
+    db.add_all(
+        ItemSummary(tenant_id=tenant, bucket=bucket, total=total, completed=completed)
+        for (tenant, bucket), (total, completed) in counts.items()
+    )
+    db.commit()
+    return counts
+
+
+def reconcile_summary(db: Session, prefixes: Iterable[str] = None) -> int:
+    """
+    Verify the stored counts against the base tables and repair any drift.
+
+    The first comparison runs without locks. Only when it finds a
+    difference (or one caused by a write landing mid-check) is the summary
+    rebuilt under a write lock.
+
+    Returns:
+        int: Number of buckets that were wrong, 0 if the summary was accurate
+    """
+    prefixes = SUMMARY_PREFIXES if prefixes is None else list(prefixes)
+    counted = _nonzero(count_summary(db, prefixes))
+    stored = _nonzero({(row.tenant_id, row.bucket): (row.total, row.completed) for row in db.query(ItemSummary)})
+    db.rollback()
+    if stored == counted:
+        return 0
+
+    counted = _nonzero(rebuild_summary(db, prefixes))
+    drifted = sum(1 for key in set(stored) | set(counted) if stored.get(key) != counted.get(key))
+    if drifted:
+        logger.warning("Item summary was off in %d bucket(s); rebuilt from the items table", drifted)
+    return drifted
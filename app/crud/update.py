@@ -1,22 +1,75 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Dict, Any, Optional
 from app.models.item import Item
-from app.schemas.item import ItemCreate
+from app.schemas.item import ItemBase, ItemPatch
+from app.events import publish_item
+from app.crud.archive import unarchive_item
+from app.crud.summary import apply_summary_delta
 
-def update_item(db: Session, item_id: int, item: ItemCreate) -> Optional[Item]:
-    update_data = item.dict(exclude_unset=True)
-    result = db.query(Item).filter(Item.id == item_id).update(update_data)
 
-    
-    if result == 0:
-      return None
-    
+class VersionConflict(Exception):
+    """The item was changed after the version the client based its update on."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Item is at version {current_version}")
+        self.current_version = current_version
+
+
+def _claim_item(db: Session, item_id: int, expected_version: Optional[int]) -> Optional[Item]:
+    """Bump a live item's version and return it with its other columns as they were."""
+    criteria = [Item.id == item_id, Item.deleted_at.is_(None)]
+    if expected_version is not None:
+        criteria.append(Item.version == expected_version)
+    # The write locks the row until commit, so nothing can change it between
+    # this statement and the one that applies the new values
+    statement = update(Item).where(*criteria).values(version=Item.version + 1).returning(*Item.__table__.c)
+    row = db.execute(statement, execution_options={"synchronize_session": False}).one_or_none()
+    if row is None:
+        return None
+    # Returned as columns and merged: an entity RETURNING would leave a copy
+    # already in the session as it was
+    claimed = Item(**row._mapping)
+    make_transient_to_detached(claimed)
+    return db.merge(claimed, load=False)
+
+
+def update_item(db: Session, item_id: int, item: ItemBase, expected_version: Optional[int] = None) -> Optional[Item]:
+    # A patch writes only the fields it was sent; any other schema replaces
+    # the item, so fields it leaves out go back to their defaults
+    update_data = item.model_dump(exclude_unset=isinstance(item, ItemPatch))
+    update_data.pop("version", None)
+    db_item = _claim_item(db, item_id, expected_version)
+    if db_item is None and unarchive_item(db, item_id):
+        # Editing an archived item brings it back to the live table
+        db_item = _claim_item(db, item_id, expected_version)
+    if db_item is None:
+        current_version = None
+        if expected_version is not None:
+            current_version = db.query(Item.version).filter(
+                Item.id == item_id, Item.deleted_at.is_(None)
+            ).scalar()
+        db.rollback()
+        if current_version is not None:
+            raise VersionConflict(current_version)
+        return None
 
+    # The claim only changed the version, so title and completed are still
+    # the values the summary counted
+    before = (db_item.title, db_item.completed)
+    values = {**update_data, "updated_at": datetime.utcnow()}
+    db.query(Item).filter(Item.id == item_id).update(values, synchronize_session=False)
 
+    # The row now holds exactly these values, so the object is brought up to
+    # date without reading it back
+    for key, value in values.items():
+        set_committed_value(db_item, key, value)
+    apply_summary_delta(db, before, (db_item.title, db_item.completed))
     db.commit()
-    updated_item = db.query(Item).filter(Item.id == item_id).first()
-    db.refresh(updated_item)
-    return updated_item
+    publish_item("update", db_item)
+    return db_item
 
 
 
@@ -1,24 +1,503 @@
-from sqlalchemy import create_engine
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./database/items.db"
+from app.locks import ProcessLock
 
-# Create SQLite engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+from app.tenancy import (
+    DEFAULT_TENANT,
+    TENANT_DATABASE_DIR,
+    TENANT_HEADER,
+    TENANT_DATABASES,
+    TENANT_ENGINE_CACHE,
+    TenantEnginePool,
+    resolve_tenant,
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database/items.db")
+
+# Optional read replica (e.g. a Postgres standby). When unset, SQLite databases
+# are read through read-only URI connections to the same WAL file, and other
+# backends fall back to the writer.
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# Seconds a client is pinned to the writer after a write ("read-your-writes")
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+WRITER_PIN_COOKIE = "db_writer_pin"
+
+# Connection pool tuning (applies to both the writer and the reader pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def statistics(self) -> dict:
+        with self._stats_lock:
+            checkouts, wait_total, wait_max = self.checkouts, self.wait_total, self.wait_max
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": checkouts,
+            "wait_avg_ms": round(wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "wait_max_ms": round(wait_max * 1000, 3),
+        }
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _sqlite_path(url: str) -> str:
+    return url.split(":///", 1)[1] if ":///" in url else ""
+
+
+def _pool_kwargs(url: str) -> dict:
+    if _is_sqlite(url) and _sqlite_path(url).split("?")[0] in ("", ":memory:"):
+        # An in-memory database only exists on its own connection
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_use_lifo": True,
+    }
+
+
+def sqlite_read_only_url(url: str) -> str:
+    """Turn a SQLite file URL into a read-only (``mode=ro``) URI connection URL."""
+    return f"sqlite:///file:{_sqlite_path(url)}?mode=ro&uri=true"
+
+
+def create_writer_engine(url: str):
+    """Create the primary (read/write) engine."""
+    if not _is_sqlite(url):
+        return create_engine(url, pool_pre_ping=True, **_pool_kwargs(url))
+
+    writer = create_engine(
+        url, connect_args={"check_same_thread": False}, **_pool_kwargs(url)
+    )
+
+    @event.listens_for(writer, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets the read-only connections read while a write is in progress
+        cursor = dbapi_connection.cursor()
+        # Only takes effect on a new database (or after a VACUUM), so it has to
+        # come first: lets the maintenance task release free pages in batches
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return writer
+
+
+def create_reader_engine(url: str, writer, read_url: str = None):
+    """
+    Create the engine used by read-only routes.
+
+    Reads run in autocommit mode, so a read-only request pays for neither
+    BEGIN nor the ROLLBACK when its connection goes back to the pool.
+
+    Args:
+        url (str): URL of the primary database
+        writer: The writer engine, reused when no separate reader is possible
+        read_url (str): Optional replica URL
+
+    Returns:
+        Engine: The reader engine
+    """
+    if read_url:
+        if _is_sqlite(read_url):
+            return create_engine(
+                read_url,
+                connect_args={"check_same_thread": False},
+                isolation_level="AUTOCOMMIT",
+                **_pool_kwargs(read_url),
+            )
+        return create_engine(
+            read_url, isolation_level="AUTOCOMMIT", pool_pre_ping=True, **_pool_kwargs(read_url)
+        )
+
+    if not _is_sqlite(url) or _sqlite_path(url) in ("", ":memory:"):
+        return writer
+
+    return create_engine(
+        sqlite_read_only_url(url),
+        connect_args={"check_same_thread": False},
+        isolation_level="AUTOCOMMIT",
+        **_pool_kwargs(url),
+    )
+
+
+# Create the writer and reader engines
+engine = create_writer_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_reader_engine(
+    SQLALCHEMY_DATABASE_URL, engine, SQLALCHEMY_READ_DATABASE_URL
+)
+
+# Create SessionLocal (writer) and ReadSessionLocal (reader) classes
+# Sessions live for one request. Objects keep their values after commit, so a
+# write can respond with what it just wrote without reloading the row
+SESSION_OPTIONS = {"autocommit": False, "autoflush": False, "expire_on_commit": False}
+SessionLocal = sessionmaker(bind=engine, **SESSION_OPTIONS)
+ReadSessionLocal = sessionmaker(bind=read_engine, **SESSION_OPTIONS)
 
 # Create Base class
 Base = declarative_base()
 
-# Dependency
-def get_db():
-    db = SessionLocal()
+
+def migrate_schema(bind):
+    """
+    Bring an existing database up to date with the models.
+
+    create_all() only creates missing tables, so columns and indexes added
+    to a model later are added here, and indexes the models no longer
+    declare are dropped. New columns must be nullable or have a server
+    default. Tables marked `info={"derived": True}` hold data recomputed
+    from other tables; they are recreated empty when their primary key
+    changed, and the caller has to recompute them. SQLite tables declared
+    with `sqlite_autoincrement` but created without it are rebuilt with
+    their rows, so ids are never reused from then on.
+
+    Returns:
+        set: Names of the derived tables that were recreated
+    """
+    inspector = inspect(bind)
+    recreated = set()
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            primary_key = inspector.get_pk_constraint(table.name)["constrained_columns"]
+            if table.info.get("derived") and primary_key != [column.name for column in table.primary_key]:
+                table.drop(conn)
+                table.create(conn)
+                recreated.add(table.name)
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    default = default.text if hasattr(default, "text") else f"'{default}'"
+                    ddl += f" NOT NULL DEFAULT {default}" if not column.nullable else f" DEFAULT {default}"
+                conn.execute(text(ddl))
+            if _needs_autoincrement(conn, table):
+                _rebuild_with_autoincrement(conn, table)
+                continue
+            declared = {index.name for index in table.indexes}
+            for index in inspector.get_indexes(table.name):
+                if index["name"] not in declared and not index.get("duplicates_constraint"):
+                    conn.execute(text(f"DROP INDEX {index['name']}"))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    return recreated
+
+
+def _needs_autoincrement(conn, table) -> bool:
+    if conn.dialect.name != "sqlite" or not table.kwargs.get("sqlite_autoincrement"):
+        return False
+    sql = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+    ).scalar()
+    return "AUTOINCREMENT" not in sql.upper()
+
+
+def _rebuild_with_autoincrement(conn, table):
+    """
+    Recreate a SQLite table with AUTOINCREMENT, keeping its rows and ids.
+
+    SQLite cannot add AUTOINCREMENT to an existing table. The old table is
+    renamed, the declared one created, and the rows copied across. Its
+    sequence starts above the highest id in the table and in any table
+    named in `info["shares_ids_with"]`.
+    """
+    old_name = f"{table.name}__rebuild"
+    conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {old_name}")
+    # The old indexes moved with the table but keep the names the new one needs
+    old_indexes = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (old_name,),
+    ).scalars().all()
+    for name in old_indexes:
+        conn.exec_driver_sql(f"DROP INDEX {name}")
+    table.create(conn)
+    columns = ", ".join(f'"{column.name}"' for column in table.columns)
+    conn.exec_driver_sql(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}")
+    conn.exec_driver_sql(f"DROP TABLE {old_name}")
+
+    # Rows moved to a table sharing the id space must not get their ids back
+    primary_key = list(table.primary_key)[0].name
+    sources = [table.name] + [
+        name for name in table.info.get("shares_ids_with", ()) if inspect(conn).has_table(name)
+    ]
+    highest = " UNION ALL ".join(f"SELECT max({primary_key}) AS id FROM {name}" for name in sources)
+    seq = conn.exec_driver_sql(f"SELECT coalesce(max(id), 0) FROM ({highest})").scalar()
+    conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (table.name,))
+    conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table.name, seq))
+
+
+def _create_and_migrate(writer, lock_name: str):
+    """Create and migrate one database under a cross-process lock."""
+    # Imported here: the models and CRUD modules import this one
+    from app.crud.summary import rebuild_summary
+    import app.models.idempotency  # noqa: F401 - registers the table
+    import app.models.item  # noqa: F401 - registers the tables
+    from app.models.summary import ItemSummary
+
+    with ProcessLock(lock_name):
+        tables = set(inspect(writer).get_table_names())
+        Base.metadata.create_all(bind=writer)
+        recount = ItemSummary.__tablename__ in migrate_schema(writer)
+        if ItemSummary.__tablename__ not in tables and "items" in tables:
+            # A database from before the summary existed gets the table
+            # empty; count the items it already holds
+            with writer.connect() as conn:
+                recount = conn.execute(text("SELECT EXISTS (SELECT 1 FROM items)")).scalar()
+        if recount:
+            # Recount before serving requests, which only apply deltas
+            with Session(bind=writer, **SESSION_OPTIONS) as db:
+                rebuild_summary(db)
+
+
+def prepare_database():
+    """
+    Create and migrate the main database, one process at a time.
+
+    Workers started without a preloading master all import the application
+    at once. Under the migration lock only one of them changes the schema;
+    the others wait, then find nothing left to do. Derived tables recreated
+    by the migration are recomputed before the lock is released.
+    """
+    _create_and_migrate(engine, "migrate")
+
+
+@dataclass
+class TenantDatabase:
+    """Engines and session factories of one tenant's own database file."""
+    writer: object
+    reader: object
+    Session: sessionmaker
+    ReadSession: sessionmaker
+
+    def dispose(self):
+        self.writer.dispose()
+        if self.reader is not self.writer:
+            self.reader.dispose()
+
+
+def open_tenant_database(tenant: str) -> TenantDatabase:
+    """Open (and create or migrate if needed) the SQLite file of a tenant."""
+    os.makedirs(TENANT_DATABASE_DIR, exist_ok=True)
+    url = f"sqlite:///{os.path.join(TENANT_DATABASE_DIR, tenant)}.db"
+    writer = create_writer_engine(url)
+    # Workers can get a tenant's first requests at the same time
+    _create_and_migrate(writer, f"migrate-{tenant}")
+    reader = create_reader_engine(url, writer)
+    return TenantDatabase(
+        writer,
+        reader,
+        sessionmaker(bind=writer, **SESSION_OPTIONS),
+        sessionmaker(bind=reader, **SESSION_OPTIONS),
+    )
+
+
+# Per-tenant databases (TENANT_DATABASES=1), least recently used closed first
+tenant_databases = TenantEnginePool(open_tenant_database, TenantDatabase.dispose, TENANT_ENGINE_CACHE)
+
+
+def tenant_sessionmakers(tenant: str) -> Tuple[Callable, Callable]:
+    """
+    Writer and reader session factories for one tenant.
+
+    Sessions from them are scoped to the tenant (see app.tenancy), whether
+    the tenant shares the main database or has its own file. The default
+    tenant always uses the main database, which holds the rows written
+    before tenants existed.
+    """
+    if TENANT_DATABASES and tenant != DEFAULT_TENANT:
+        database = tenant_databases.get(tenant)
+        writer, reader = database.Session, database.ReadSession
+    else:
+        writer, reader = SessionLocal, ReadSessionLocal
+    info = {"tenant_id": tenant}
+    return partial(writer, info=info), partial(reader, info=info)
+
+
+class LazySession:
+    """
+    Session proxy that only creates the real Session on first use.
+
+    Requests that never reach the database (validation errors, early
+    returns) pay nothing for it.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def pool_statistics() -> dict:
+    """Checkout statistics of the writer and reader connection pools."""
+    stats = {}
+    for name, pool in (("writer", engine.pool), ("reader", read_engine.pool)):
+        if isinstance(pool, InstrumentedQueuePool):
+            stats[name] = pool.statistics()
+    return stats
+
+
+async def _close_session(db: LazySession):
+    # Only a session that checked out a connection has I/O to do on close
+    if db.started:
+        await run_in_threadpool(db.close)
+
+
+def _is_pinned_to_writer(request: Request) -> bool:
+    pinned_until = request.cookies.get(WRITER_PIN_COOKIE)
+    try:
+        return pinned_until is not None and float(pinned_until) > time.time()
+    except ValueError:
+        return False
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_write(execute_state):
+    if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+        execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    # Only a commit that made it to the database counts as a write; reads,
+    # rolled-back writes and empty commits leave the client where it was
+    if session.info.pop("wrote", False) and "after_write_commit" in session.info:
+        session.info["after_write_commit"]()
+
+
+def _pin_after_write(session: Session, request: Request) -> Session:
+    # Picked up by WriterPinMiddleware when the response starts
+    session.info["after_write_commit"] = partial(setattr, request.state, "writer_pinned", True)
+    return session
+
+
+def _writer_pin_cookie() -> str:
+    cookie = Response()
+    cookie.set_cookie(
+        WRITER_PIN_COOKIE,
+        str(time.time() + READ_YOUR_WRITES_WINDOW),
+        max_age=math.ceil(READ_YOUR_WRITES_WINDOW),
+        httponly=True,
+        samesite="lax",
+    )
+    return cookie.headers["set-cookie"]
+
+
+class WriterPinMiddleware:
+    """
+    Pins clients to the writer for READ_YOUR_WRITES_WINDOW after a committed write.
+
+    Sets the cookie on the way out rather than in get_db, so it only goes
+    to requests whose write transaction committed, and it also reaches
+    routes that return their own Response object.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and scope.get("state", {}).get("writer_pinned"):
+                MutableHeaders(scope=message).append("set-cookie", _writer_pin_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+
+# Dependencies
+async def get_db(request: Request):
+    """Writer session of the request's tenant; a committed write pins the client to the writer for a while."""
+    writer, _ = tenant_sessionmakers(resolve_tenant(request.headers.get(TENANT_HEADER)))
+    factory = writer
+    if READ_YOUR_WRITES_WINDOW > 0:
+        factory = lambda: _pin_after_write(writer(), request)
+    db = LazySession(factory)
+    try:
+        yield db
+    finally:
+        await _close_session(db)
+
+
+async def get_read_db(request: Request):
+    """Reader session of the request's tenant for GET routes, or the writer if the client wrote recently."""
+    writer, reader = tenant_sessionmakers(resolve_tenant(request.headers.get(TENANT_HEADER)))
+    db = LazySession(writer if _is_pinned_to_writer(request) else reader)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        await _close_session(db)
@@ -0,0 +1,174 @@
+"""
+In-process change feed for items.
+
+The CRUD mutation functions publish create/update/delete events here and
+`GET /api/items/changes` streams them to clients as Server-Sent Events.
+Each subscriber gets a bounded buffer; a subscriber that falls behind is
+disconnected and resumes from its last event id, which is replayed from
+a short in-memory history. Subscribers only see events of their own
+tenant.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.schemas.item import item_values
+from app.tenancy import DEFAULT_TENANT
+
+# Number of recent events kept for clients resuming with Last-Event-ID
+HISTORY_SIZE = int(os.getenv("CHANGE_FEED_HISTORY", "1000"))
+# Events buffered per subscriber before it is considered too slow
+SUBSCRIBER_BUFFER = int(os.getenv("CHANGE_FEED_BUFFER", "256"))
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15.0
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: int
+    type: str
+    data: Dict[str, Any]
+    # None for events meant for every subscriber (reset)
+    tenant: Optional[str] = None
+
+    def visible_to(self, tenant: str) -> bool:
+        return self.tenant is None or self.tenant == tenant
+
+    def encode(self) -> str:
+        """Serialize the event in text/event-stream format."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+class Subscription:
+    """A single client's view of the feed: a bounded queue fed from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, tenant: str):
+        self.loop = loop
+        self.tenant = tenant
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def _deliver(self, event: ChangeEvent):
+        # Runs on the subscriber's event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the subscriber; it reconnects and resumes from history
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[ChangeEvent]:
+        """Wait for the next event; None means the subscriber fell behind."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeFeed:
+    """Thread-safe publish/subscribe hub with a replayable event history."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE, subscriber_buffer: int = SUBSCRIBER_BUFFER):
+        self._lock = threading.Lock()
+        # Ids start from the boot time so ids from a previous process are never reused
+        self._last_id = int(time.time() * 1000)
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers: set = set()
+        self._subscriber_buffer = subscriber_buffer
+
+    def publish(self, event_type: str, data: Dict[str, Any], tenant: Optional[str] = None) -> ChangeEvent:
+        """Record an event and hand it to the tenant's subscribers. Safe to call from any thread."""
+        with self._lock:
+            self._last_id += 1
+            event = ChangeEvent(self._last_id, event_type, data, tenant)
+            self._history.append(event)
+            subscribers = [s for s in self._subscribers if event.visible_to(s.tenant)]
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None, tenant: str = DEFAULT_TENANT):
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            last_event_id (Optional[int]): Id of the last event the client saw
+            tenant (str): Only events of this tenant are delivered
+
+        Returns:
+            tuple: (Subscription, events to replay first). If the client is too
+            far behind to resume, the replay is a single "reset" event telling
+            it to reload the full list.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self._subscriber_buffer, tenant)
+        with self._lock:
+            backlog: List[ChangeEvent] = []
+            if last_event_id is not None and last_event_id != self._last_id:
+                oldest = self._history[0].id if self._history else self._last_id + 1
+                if last_event_id > self._last_id or last_event_id < oldest - 1:
+                    backlog = [ChangeEvent(self._last_id, "reset", {})]
+                else:
+                    backlog = [
+                        event for event in self._history if event.id > last_event_id and event.visible_to(tenant)
+                    ]
+            self._subscribers.add(subscription)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+# Process-wide feed used by the CRUD layer and the SSE route
+feed = ChangeFeed()
+
+
+def publish(event_type: str, data: Dict[str, Any], tenant: Optional[str] = None) -> ChangeEvent:
+    return feed.publish(event_type, data, tenant)
+
+
+def publish_item(event_type: str, db_item) -> ChangeEvent:
+    """Publish an event carrying the API representation of an Item, for the item's tenant."""
+    return feed.publish(event_type, item_values(db_item), db_item.tenant_id)
+
+
+async def event_stream(request, last_event_id: Optional[int] = None, tenant: str = DEFAULT_TENANT):
+    """
+    Async generator producing the text/event-stream body for one client.
+
+    Args:
+        request: The Starlette request, used to detect disconnects
+        last_event_id (Optional[int]): Resume point sent by the client
+        tenant (str): Tenant whose changes are streamed
+    """
+    subscription, backlog = feed.subscribe(last_event_id, tenant)
+    try:
+        yield "retry: 3000\n\n"
+        for event in backlog:
+            yield event.encode()
+
+        while True:
+            try:
+                event = await subscription.get(HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield event.encode()
+    finally:
+        feed.unsubscribe(subscription)
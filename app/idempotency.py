@@ -0,0 +1,146 @@
+"""
+Idempotency-Key support for mutating routes.
+
+The first request with a given key reserves it, runs, and stores its
+response in the same transaction as its write, so a crash or failed commit
+can never leave a written item behind a key that is still pending. Retries with the same key get the stored response back without
+running the operation again. Retries that arrive while the original is
+still running get a 409 at once, whether it runs in this process or in
+another worker, so a burst of retries never parks worker threads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.crud.idempotency import (
+    complete_idempotency_key,
+    delete_idempotency_key,
+    get_idempotency_key,
+    reserve_idempotency_key,
+)
+from app.tenancy import session_tenant
+
+# Seconds a key (and its stored response) is kept
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+# Seconds after which an unfinished reservation is treated as abandoned
+PENDING_TIMEOUT = 60.0
+
+
+class IdempotencyError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class IdempotentResult:
+    status_code: int
+    body: Any
+    replayed: bool
+    etag: Optional[str] = None
+
+
+_running = set()
+_running_guard = threading.Lock()
+
+
+@contextmanager
+def _single_flight(key: str):
+    """Run one request per key at a time within this process; others get a 409."""
+    with _running_guard:
+        if key in _running:
+            raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+        _running.add(key)
+    try:
+        yield
+    finally:
+        with _running_guard:
+            _running.discard(key)
+
+
+def request_hash(scope: str, payload: Any) -> str:
+    """Fingerprint of a request, so a key reused for a different request is caught."""
+    encoded = json.dumps([scope, payload], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def run_idempotent(
+    db: Session,
+    key: str,
+    scope: str,
+    payload: Any,
+    operation: Callable[[Callable[[Any], None]], Any],
+    status_code: int,
+) -> IdempotentResult:
+    """
+    Run `operation` at most once per idempotency key.
+
+    Keys are per tenant: two tenants may use the same key independently.
+
+    Args:
+        db (Session): Database session
+        key (str): The client's Idempotency-Key
+        scope (str): Method and route, e.g. "POST /api/items/"
+        payload: JSON-serializable request body
+        operation: Performs the write and returns the JSON-serializable response body.
+            It is called with `record(body, etag=None)`, which stages the stored
+            response (and its ETag header) in `db`; call it before committing
+            the write. Operations that never call it get the response stored
+            in a transaction of its own, without an ETag
+        status_code (int): Status code of a successful response
+
+    Returns:
+        IdempotentResult: The response to send and whether it was replayed
+
+    Raises:
+        IdempotencyError: 422 if the key was used for a different request,
+            409 if the original request is still running
+    """
+    fingerprint = request_hash(scope, payload)
+    tenant = session_tenant(db)
+    if tenant is not None:
+        key = f"{tenant}/{key}"
+    with _single_flight(key):
+        while not reserve_idempotency_key(db, key, fingerprint):
+            record = get_idempotency_key(db, key, IDEMPOTENCY_TTL)
+            if record is None:
+                # Expired: drop it and reserve again
+                delete_idempotency_key(db, key)
+                continue
+            if record.request_hash != fingerprint:
+                raise IdempotencyError(422, "Idempotency-Key was already used for a different request")
+            if record.status_code is not None:
+                return IdempotentResult(record.status_code, json.loads(record.response_body), True, record.etag)
+            if record.created_at < datetime.utcnow() - timedelta(seconds=PENDING_TIMEOUT):
+                delete_idempotency_key(db, key)
+                continue
+            raise IdempotencyError(409, "A request with this Idempotency-Key is still in progress")
+
+        recorded = []
+
+        def record(body: Any, etag: Optional[str] = None):
+            complete_idempotency_key(db, key, status_code, json.dumps(body), etag)
+            recorded.append(etag)
+
+        try:
+            body = operation(record)
+        except BaseException:
+            db.rollback()
+            stored = get_idempotency_key(db, key, IDEMPOTENCY_TTL)
+            if stored is None or stored.status_code is None:
+                # Nothing was committed; a retry may run the operation again
+                delete_idempotency_key(db, key)
+            raise
+        if not recorded:
+            complete_idempotency_key(db, key, status_code, json.dumps(body))
+            db.commit()
+        return IdempotentResult(status_code, body, False, recorded[0] if recorded else None)
@@ -0,0 +1,70 @@
+"""
+Advisory locks shared by every process on the host.
+
+Several worker processes run the same application against one database
+file. Work that must happen in only one of them at a time (schema
+migrations) or in only one of them at all (background maintenance) takes
+a lock on a file under LOCK_DIR. The operating system releases it when the
+holding process exits, so a crashed worker never leaves a stale lock.
+
+Platforms without `fcntl` (Windows) get no cross-process exclusion; run a
+single worker there.
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Directory of the lock files; must be on the same host as every worker
+LOCK_DIR = os.getenv("LOCK_DIR", "./database")
+
+
+class ProcessLock:
+    """Exclusive `flock` on LOCK_DIR/<name>.lock, held until released."""
+
+    def __init__(self, name: str, directory: str = None):
+        self.path = os.path.join(directory or LOCK_DIR, f"{name}.lock")
+        self._file = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; without `blocking`, return False if another process holds it."""
+        with self._thread_lock:
+            if self._file is not None:
+                return True
+            if fcntl is None:
+                self._file = True
+                return True
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            lock_file = open(self.path, "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                return False
+            self._file = lock_file
+            return True
+
+    def release(self):
+        with self._thread_lock:
+            if self._file is None:
+                return
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+                self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
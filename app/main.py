@@ -1,20 +1,41 @@
 
 from fastapi import FastAPI, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+import json
 import os
 
-from app.database import engine
-from app.models.item import Item
+from app.caching import CachedDocument
+from app.models.item import Item, ArchivedItem
+from app.models.idempotency import IdempotencyKey
+from app.models.summary import ItemSummary
+from app.concurrency import configure_threadpool
+from app.maintenance import maintenance
+from app.ratelimit import RATE_LIMIT_ENABLED, RateLimitMiddleware
 import app.routes.item as item_routes
+import app.routes.admin as admin_routes
+import app.routes.websocket as websocket_routes
 
-# Create tables in the database
-from app.database import Base
-Base.metadata.create_all(bind=engine)
+# Create tables in the database, and add columns/indexes missing from older
+# ones. The launcher already did this before starting workers; here it is a
+# no-op then, and serialized across workers started without it
+from app.database import READ_YOUR_WRITES_WINDOW, WriterPinMiddleware, prepare_database
+prepare_database()
 
-# Initialize FastAPI app
-app = FastAPI(title="FastAPI CRUD App")
+# Initialize FastAPI app. The OpenAPI schema and docs pages are served from
+# memory below instead of being generated on first request
+OPENAPI_URL = "/openapi.json"
+app = FastAPI(title="FastAPI CRUD App", openapi_url=None, docs_url=None, redoc_url=None)
+
+# Throttle clients per route cost and cap their concurrent requests
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Send the read-your-writes cookie after committed writes
+if READ_YOUR_WRITES_WINDOW > 0:
+    app.add_middleware(WriterPinMiddleware)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -24,16 +45,81 @@ templates = Jinja2Templates(directory="app/templates")
 
 # Include routers
 app.include_router(item_routes.router)
+app.include_router(admin_routes.router)
+app.include_router(websocket_routes.router)
+
+# Size the default threadpool used by sync routes and dependencies
+@app.on_event("startup")
+async def size_threadpool():
+    configure_threadpool()
+
+# Purge tombstones and expired idempotency keys, and vacuum, in the background
+@app.on_event("startup")
+async def start_maintenance():
+    maintenance.start()
+
+@app.on_event("shutdown")
+async def stop_maintenance():
+    await maintenance.stop()
 
 # Root endpoint
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
-
-# Run with: uvicorn app.main:app --reload
+    return documents_for(request)["index"].response(request)
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def read_openapi(request: Request):
+    return documents_for(request)["openapi"].response(request)
+
+@app.get("/docs", include_in_schema=False)
+async def read_docs(request: Request):
+    return documents_for(request)["docs"].response(request)
+
+@app.get("/redoc", include_in_schema=False)
+async def read_redoc(request: Request):
+    return documents_for(request)["redoc"].response(request)
+
+def build_documents(root_path: str = "") -> dict:
+    """Render the pages that never change while the process runs, for one path prefix."""
+    # The page has no per-request data; static URLs are rendered as paths
+    index = templates.get_template("index.html").render(
+        url_for=lambda name, **path_params: root_path + app.url_path_for(name, **path_params),
+        root_path=root_path,
+    )
+    schema = app.openapi()
+    if root_path and app.root_path_in_servers:
+        # As FastAPI's own schema route does behind a proxy prefix
+        schema = {**schema, "servers": [{"url": root_path}, *schema.get("servers", [])]}
+    # Same encoding as FastAPI's JSONResponse
+    openapi = json.dumps(schema, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    docs = get_swagger_ui_html(openapi_url=root_path + OPENAPI_URL, title=f"{app.title} - Swagger UI")
+    redoc = get_redoc_html(openapi_url=root_path + OPENAPI_URL, title=f"{app.title} - ReDoc")
+    html = "text/html"
+    return {
+        "index": CachedDocument(index.encode(), html),
+        "openapi": CachedDocument(openapi.encode(), "application/json"),
+        "docs": CachedDocument(docs.body, html),
+        "redoc": CachedDocument(redoc.body, html),
+    }
+
+def documents_for(request: Request) -> dict:
+    """The documents for the path prefix the request was served under."""
+    # root_path comes from FastAPI(root_path=...) or the server's --root-path
+    root_path = request.scope.get("root_path", "").rstrip("/")
+    if root_path not in documents:
+        documents[root_path] = build_documents(root_path)
+    return documents[root_path]
+
+# Built at import, after every route is registered; with a preloading
+# launcher the workers inherit them from the master process. A deployment
+# serves one prefix, so other prefixes are built on their first request
+documents = {app.root_path.rstrip("/"): build_documents(app.root_path.rstrip("/"))}
+
+# Development: uvicorn app.main:app --reload
+# Production: python -m app.server (one worker per CPU core)
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    from app.server import main
+    main()
 
 """
 # IGNORE THE FOLLOWING SECTION
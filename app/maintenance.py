@@ -0,0 +1,260 @@
+"""
+Background database maintenance.
+
+A periodic task hard-deletes soft-deleted items once they are older than
+TOMBSTONE_RETENTION and moves items completed more than ARCHIVE_AFTER ago
+to the archive table (both in small batches, so writes from requests
+interleave), drops expired idempotency keys, checks the item summary
+against the base tables every SUMMARY_RECONCILE_INTERVAL, and reclaims free
+pages in the SQLite file.
+Reclaiming only happens during quiet periods, i.e. when no connection was
+checked out of either pool since the previous cycle.
+With TENANT_DATABASES=1 the purge, archive, key expiry and summary checks
+also run on every tenant database that is open at the time.
+With several worker processes, only the one holding the maintenance lock
+runs cycles; the others try to take it over every interval, so the work
+moves to another worker when the holder exits.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal, engine, pool_statistics, tenant_databases
+from app.crud.archive import archive_completed_items, ids_are_never_reused
+from app.crud.delete import purge_deleted_items
+from app.crud.summary import reconcile_summary
+from app.crud.idempotency import purge_expired_idempotency_keys
+from app.idempotency import IDEMPOTENCY_TTL
+from app.locks import ProcessLock
+from app.models.item import ArchivedItem, Item
+from app.tenancy import TENANT_DATABASES
+
+logger = logging.getLogger(__name__)
+
+# Seconds between maintenance cycles
+MAINTENANCE_INTERVAL = float(os.getenv("MAINTENANCE_INTERVAL", "60"))
+# Seconds a soft-deleted item can still be restored before it is purged
+TOMBSTONE_RETENTION = float(os.getenv("TOMBSTONE_RETENTION", str(7 * 24 * 60 * 60)))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+# Seconds after its last update that a completed item is archived; 0 disables
+ARCHIVE_AFTER = float(os.getenv("ARCHIVE_AFTER", str(30 * 24 * 60 * 60)))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Seconds between full recounts of the item summary (the first cycle always runs one)
+SUMMARY_RECONCILE_INTERVAL = float(os.getenv("SUMMARY_RECONCILE_INTERVAL", "3600"))
+# Batches per cycle (purge and archive each); the rest waits for the next cycle
+PURGE_MAX_BATCHES = 20
+# Pages released per incremental_vacuum step
+INCREMENTAL_VACUUM_PAGES = 1000
+# Fraction of free pages that triggers a full VACUUM on non-incremental databases
+VACUUM_FREE_RATIO = 0.2
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def storage_statistics(bind=engine) -> dict:
+    """
+    File size and page usage of the database.
+
+    Args:
+        bind: Engine of the database to inspect
+
+    Returns:
+        dict: Sizes in bytes, page counts and the number of tombstones
+    """
+    with bind.connect() as conn:
+        tombstones = conn.execute(
+            select(func.count()).select_from(Item.__table__).where(Item.deleted_at.isnot(None))
+        ).scalar()
+        archived = conn.execute(select(func.count()).select_from(ArchivedItem.__table__)).scalar()
+        stats = {"tombstones": tombstones, "archived": archived}
+        if bind.dialect.name != "sqlite":
+            return stats
+
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        freelist_count = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        auto_vacuum = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+    path = bind.url.database
+    stats.update({
+        "file_size": os.path.getsize(path) if path and os.path.exists(path) else 0,
+        "wal_size": os.path.getsize(f"{path}-wal") if path and os.path.exists(f"{path}-wal") else 0,
+        "page_size": page_size,
+        "page_count": page_count,
+        "free_pages": freelist_count,
+        "free_ratio": round(freelist_count / page_count, 4) if page_count else 0.0,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    })
+    return stats
+
+
+def reclaim_free_pages(bind=engine) -> Optional[str]:
+    """
+    Return free pages to the file system.
+
+    Incremental-vacuum databases release a bounded number of pages per call.
+    Other databases get a full VACUUM once enough of the file is free, which
+    also switches them to incremental mode for next time.
+
+    Returns:
+        Optional[str]: "incremental", "full" or None if nothing was done
+    """
+    if bind.dialect.name != "sqlite":
+        return None
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if not free_pages:
+            return None
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            # executescript() runs the pragma to completion; a plain execute()
+            # only steps it once, which frees a single page
+            conn.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});"
+            )
+            return "incremental"
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        if free_pages / page_count < VACUUM_FREE_RATIO:
+            return None
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+        return "full"
+
+
+class MaintenanceTask:
+    """Runs maintenance cycles on the event loop, doing the work in the threadpool."""
+
+    def __init__(self, interval: float = MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._last_checkouts: Optional[int] = None
+        # Per database URL; only checked once per database
+        self._archive_supported: Dict[str, bool] = {}
+        self._last_reconcile: Optional[float] = None
+        self.last_run: Optional[dict] = None
+        # Held by the one worker process that runs maintenance
+        self._leader = ProcessLock("maintenance")
+
+    @staticmethod
+    def _checkouts() -> int:
+        return sum(pool["checkouts"] for pool in pool_statistics().values())
+
+    def _is_quiet(self) -> bool:
+        # Quiet: no request has used the database since the end of the last cycle
+        busy = any(pool["checked_out"] for pool in pool_statistics().values())
+        return not busy and self._last_checkouts == self._checkouts()
+
+    @staticmethod
+    def _in_batches(operation, cutoff: datetime, batch_size: int) -> int:
+        total = 0
+        for _ in range(PURGE_MAX_BATCHES):
+            batch = operation(cutoff, batch_size)
+            total += batch
+            if batch < batch_size:
+                break
+            time.sleep(0.01)  # Let request writes in between batches
+        return total
+
+    def _archive(self, db) -> int:
+        if ARCHIVE_AFTER <= 0:
+            return 0
+        url = str(db.get_bind().url)
+        if url not in self._archive_supported:
+            self._archive_supported[url] = ids_are_never_reused(db)
+            if not self._archive_supported[url]:
+                logger.warning(
+                    "Not archiving %s: the items table was not migrated to AUTOINCREMENT and may reuse ids",
+                    url,
+                )
+        if not self._archive_supported[url]:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(seconds=ARCHIVE_AFTER)
+        return self._in_batches(
+            lambda before, size: archive_completed_items(db, before, size), cutoff, ARCHIVE_BATCH_SIZE
+        )
+
+    def _maintain(self, db, reconcile: bool) -> dict:
+        cutoff = datetime.utcnow() - timedelta(seconds=TOMBSTONE_RETENTION)
+        return {
+            "purged_items": self._in_batches(
+                lambda before, size: purge_deleted_items(db, before, size), cutoff, PURGE_BATCH_SIZE
+            ),
+            "archived_items": self._archive(db),
+            "expired_idempotency_keys": purge_expired_idempotency_keys(db, IDEMPOTENCY_TTL),
+            "summary_drift": reconcile_summary(db) if reconcile else None,
+        }
+
+    def run_cycle(self, quiet: bool) -> dict:
+        """One maintenance pass (blocking)."""
+        started = time.perf_counter()
+        now = time.monotonic()
+        reconcile = self._last_reconcile is None or now - self._last_reconcile >= SUMMARY_RECONCILE_INTERVAL
+        factories = [SessionLocal]
+        if TENANT_DATABASES:
+            factories += [database.Session for database in tenant_databases.open_tenants().values()]
+
+        totals = {"purged_items": 0, "archived_items": 0, "expired_idempotency_keys": 0, "summary_drift": None}
+        for factory in factories:
+            db = factory()
+            try:
+                for name, value in self._maintain(db, reconcile).items():
+                    if value is not None:
+                        totals[name] = (totals[name] or 0) + value
+            finally:
+                db.close()
+        if reconcile:
+            self._last_reconcile = now
+
+        vacuum = None
+        if quiet:
+            try:
+                vacuum = reclaim_free_pages()
+            except OperationalError as e:
+                # Another worker holds the write lock; try again next cycle
+                logger.info("Skipping vacuum: %s", e)
+
+        return {
+            "finished_at": datetime.utcnow().isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            **totals,
+            "vacuum": vacuum,
+        }
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process runs the maintenance cycles."""
+        return self._leader.held
+
+    async def _run(self):
+        while True:
+            if self._leader.held or self._leader.acquire(blocking=False):
+                try:
+                    self.last_run = await run_in_threadpool(self.run_cycle, self._is_quiet())
+                except Exception:
+                    logger.exception("Maintenance cycle failed")
+            self._last_checkouts = self._checkouts()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._leader.release()
+
+
+maintenance = MaintenanceTask()
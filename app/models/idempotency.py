@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from app.database import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    # NULL until the original request has finished
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    # ETag header of the stored response, for responses that have one
+    etag = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
@@ -1,10 +1,66 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, text
 from app.database import Base
+from app.tenancy import TenantScoped
 
-class Item(Base):
+class Item(TenantScoped, Base):
     __tablename__ = "items"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
     description = Column(String)
-    completed = Column(Boolean, default=False)
\ No newline at end of file
+    completed = Column(Boolean, default=False)
+    # Set when the item is soft-deleted; NULL for live items
+    deleted_at = Column(DateTime, nullable=True)
+    # Last create or update; NULL for rows written before the column existed
+    updated_at = Column(DateTime, nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Incremented on every write; updates can require a version to detect conflicts
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Every request is scoped to one tenant, so request-path indexes lead
+        # with tenant_id. Live-row scans only walk rows that are not soft-deleted
+        Index(
+            "ix_items_tenant_live",
+            "tenant_id",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_items_tenant_title", "tenant_id", "title"),
+        # The purge and archive tasks work across tenants, so their indexes
+        # are ordered by time only.
+        # Lets the purge task find old tombstones without a full scan
+        Index(
+            "ix_items_tombstones",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        # Lets the archive task find old completed items without a full scan
+        Index(
+            "ix_items_archivable",
+            "updated_at",
+            sqlite_where=text("completed = 1 AND deleted_at IS NULL"),
+            postgresql_where=text("completed AND deleted_at IS NULL"),
+        ),
+        # Never hand out the id of a row that was moved to the archive
+        {"sqlite_autoincrement": True, "info": {"shares_ids_with": ("items_archive",)}},
+    )
+
+class ArchivedItem(TenantScoped, Base):
+    """Completed items moved out of `items` by the archive task."""
+    __tablename__ = "items_archive"
+
+    # Keeps the id the item had in `items`
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String)
+    description = Column(String)
+    completed = Column(Boolean, default=True)
+    updated_at = Column(DateTime, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    archived_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_items_archive_tenant", "tenant_id", "id"),
+    )
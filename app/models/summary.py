@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+from app.tenancy import DEFAULT_TENANT, TenantScoped
+
+class ItemSummary(TenantScoped, Base):
+    """Running item counts per tenant, kept up to date by the CRUD functions."""
+    __tablename__ = "item_summary"
+    # Derived data: recreated by migrate_schema if its key changes, then recounted
+    __table_args__ = {"info": {"derived": True}}
+
+    tenant_id = Column(String, primary_key=True, default=DEFAULT_TENANT)
+    # "*" for all items, "prefix:<prefix>" for items whose title starts with it
+    bucket = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
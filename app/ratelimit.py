@@ -0,0 +1,251 @@
+"""
+Token-bucket rate limiting and per-client concurrency caps.
+
+Every client has a bucket of RATE_LIMIT_BURST tokens refilled at
+RATE_LIMIT_RATE tokens per second. Each request spends tokens according to
+its route (list and bulk reads cost more than point reads), and a client
+with too many requests already in flight is turned away. Both cases get a
+429 with Retry-After, so an expensive scanner is slowed down instead of
+raising latency for everyone else.
+
+WebSocket connections are limited too: an open connection holds one of its
+client's in-flight slots (a handshake over the cap is refused with close
+code 1008), and every message spends the tokens of the matching REST
+route. A message that finds the bucket empty is held back until it has
+refilled, which slows the client down through the socket instead of
+failing its requests.
+
+Buckets live in memory by default. Set RATE_LIMIT_REDIS_URL to share them
+between workers and hosts (requires the `redis` package, 4.2 or later).
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+# Tokens added to each bucket per second, and the bucket size
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "50"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "200"))
+# Requests a single client may have in progress at once
+RATE_LIMIT_MAX_IN_FLIGHT = int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", "8"))
+# Header identifying the client (e.g. X-API-Key, or X-Forwarded-For behind a
+# trusted proxy). When unset, the peer address is used.
+RATE_LIMIT_CLIENT_HEADER = os.getenv("RATE_LIMIT_CLIENT_HEADER")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+
+# (method, path pattern, cost); the first match wins, anything else costs 1
+ROUTE_COSTS: List[Tuple[str, "re.Pattern", float]] = [
+    ("GET", re.compile(r"^/api/items/?$"), 5),
+    ("GET", re.compile(r"^/api/items/batch$"), 5),
+    ("GET", re.compile(r"^/api/items/export$"), 20),
+    ("POST", re.compile(r"^/api/items/batch$"), 5),
+    ("POST", re.compile(r"^/api/items/?$"), 2),
+    ("PUT", re.compile(r"^/api/items/\d+$"), 2),
+    ("PATCH", re.compile(r"^/api/items/\d+$"), 2),
+    ("DELETE", re.compile(r"^/api/items/\d+$"), 2),
+]
+
+# Paths that are never limited: the page, its assets, docs and long-lived streams
+EXEMPT_PATHS = re.compile(r"^/($|static/|docs|redoc|openapi\.json|api/items/changes$)")
+
+
+# Cost of each /ws/items method, as for the REST route doing the same; anything else costs 1
+WEBSOCKET_METHOD_COSTS: Dict[str, float] = {"get": 1, "create": 2, "update": 2, "delete": 2}
+
+
+def route_cost(method: str, path: str) -> float:
+    for route_method, pattern, cost in ROUTE_COSTS:
+        if method == route_method and pattern.match(path):
+            return cost
+    return 1
+
+
+def message_cost(message: dict) -> float:
+    """Tokens a WebSocket message spends, from its "method"."""
+    try:
+        method = json.loads(message.get("text") or "null")["method"]
+    except (ValueError, TypeError, KeyError):
+        return 1
+    return WEBSOCKET_METHOD_COSTS.get(method, 1) if isinstance(method, str) else 1
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets in a bounded LRU map; every update is O(1)."""
+
+    def __init__(self, max_clients: int = 100_000):
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_clients = max_clients
+
+    async def consume(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from a client's bucket.
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed, and seconds
+            until enough tokens are available if it is not
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self._max_clients:
+                # Evict the least recently seen client (its bucket would be full anyway)
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class RedisRateLimitBackend:
+    """Token buckets in Redis, updated atomically by a Lua script."""
+
+    SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    local tokens = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        # Optional dependency, only needed for a shared backend. The asyncio
+        # client keeps a slow Redis round trip from blocking the event loop
+        import redis.asyncio
+
+        self._client = redis.asyncio.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def consume(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, cost, time.time()])
+        if allowed:
+            return True, 0.0
+        return False, (cost - float(tokens)) / rate
+
+
+def create_backend():
+    if RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying the token bucket and the in-flight cap per client."""
+
+    def __init__(
+        self,
+        app,
+        backend=None,
+        rate: float = RATE_LIMIT_RATE,
+        burst: float = RATE_LIMIT_BURST,
+        max_in_flight: int = RATE_LIMIT_MAX_IN_FLIGHT,
+        client_header: Optional[str] = RATE_LIMIT_CLIENT_HEADER,
+    ):
+        self.app = app
+        self.backend = backend or create_backend()
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.client_header = client_header.lower().encode() if client_header else None
+        self._in_flight: Dict[str, int] = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _client_id(self, scope) -> str:
+        if self.client_header:
+            for name, value in scope["headers"]:
+                if name == self.client_header:
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or EXEMPT_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        websocket = scope["type"] == "websocket"
+        reject = self._reject_websocket if websocket else self._reject
+
+        client_id = self._client_id(scope)
+        # The cap is checked first, so a request turned away by it spends no tokens
+        if not self._enter(client_id):
+            await reject(send, "Too many concurrent requests", 1.0)
+            return
+        try:
+            cost = route_cost(scope.get("method", "GET"), scope["path"])
+            allowed, retry_after = await self.backend.consume(client_id, cost, self.rate, self.burst)
+            if not allowed:
+                await reject(send, "Rate limit exceeded", retry_after)
+                return
+
+            if websocket:
+                receive = self._throttled(receive, client_id)
+            await self.app(scope, receive, send)
+        finally:
+            self._leave(client_id)
+
+    def _enter(self, client_id: str) -> bool:
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(client_id, 0)
+            if in_flight >= self.max_in_flight:
+                return False
+            self._in_flight[client_id] = in_flight + 1
+            return True
+
+    def _leave(self, client_id: str):
+        with self._in_flight_lock:
+            remaining = self._in_flight[client_id] - 1
+            if remaining:
+                self._in_flight[client_id] = remaining
+            else:
+                del self._in_flight[client_id]
+
+    def _throttled(self, receive, client_id: str):
+        """Wrap a WebSocket's receive so every message spends tokens."""
+        async def throttled_receive():
+            message = await receive()
+            if message["type"] == "websocket.receive":
+                cost = min(message_cost(message), self.burst)
+                while True:
+                    allowed, retry_after = await self.backend.consume(client_id, cost, self.rate, self.burst)
+                    if allowed:
+                        break
+                    # Later messages wait in the socket meanwhile
+                    await asyncio.sleep(retry_after)
+            return message
+        return throttled_receive
+
+    @staticmethod
+    async def _reject(send, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _reject_websocket(send, detail: str, retry_after: float):
+        # Closing before the handshake is accepted refuses the connection
+        await send({"type": "websocket.close", "code": 1008, "reason": detail})
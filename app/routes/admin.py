@@ -0,0 +1,91 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.backup import BackupError, backups, iter_file
+from app.concurrency import threadpool_statistics
+from app.database import pool_statistics, tenant_databases
+from app.maintenance import maintenance, storage_statistics
+
+# When set, admin endpoints require a matching X-Admin-Token header. Backup
+# endpoints are disabled entirely without it, since they expose the database.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if ADMIN_TOKEN and not secrets.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def require_admin_token_configured():
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Set ADMIN_TOKEN to enable backups")
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+@router.get("/pool")
+def read_pool_statistics():
+    """Get checkout statistics for the writer and reader connection pools"""
+    return pool_statistics()
+
+@router.get("/tenants")
+def read_tenant_statistics():
+    """Get how many per-tenant databases are open and how many were opened and evicted"""
+    return tenant_databases.statistics()
+
+@router.get("/threadpool")
+async def read_threadpool_statistics():
+    """Get running, queued and queueing-delay figures for the point and scan executors"""
+    return threadpool_statistics()
+
+@router.get("/storage")
+def read_storage_statistics():
+    """Get database file size, free pages, tombstones and the last maintenance run"""
+    # With several workers only one runs maintenance; the others report no run
+    return {
+        "storage": storage_statistics(),
+        "maintenance": maintenance.last_run,
+        "maintenance_leader": maintenance.is_leader,
+    }
+
+# BACKUP operations
+@router.post(
+    "/backup",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_admin_token_configured)],
+)
+def start_backup():
+    """Start a hot backup of the database in the background"""
+    try:
+        job = backups.start()
+    except BackupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job.to_dict()
+
+@router.get("/backup/{job_id}", dependencies=[Depends(require_admin_token_configured)])
+def read_backup(job_id: str):
+    """Get the progress of a backup"""
+    job = backups.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    return job.to_dict()
+
+@router.get("/backup/{job_id}/download", dependencies=[Depends(require_admin_token_configured)])
+def download_backup(job_id: str, compress: bool = False):
+    """Download a finished backup, optionally gzip-compressed while streaming"""
+    job = backups.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Backup is {job.status}")
+    filename = os.path.basename(job.path) + (".gz" if compress else "")
+    return StreamingResponse(
+        iter_file(job.path, compress=compress),
+        media_type="application/gzip" if compress else "application/vnd.sqlite3",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,50 +1,260 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.database import get_db
-from app.schemas.item import Item, ItemCreate
+from app.concurrency import point_executor, scan_executor
+from app.database import get_db, get_read_db
+from app.schemas.item import (
+    Item, ItemCreate, ItemPatch, ItemUpdate, ItemBatchRequest, ItemBatchResult, ItemSummary, SummaryCounts,
+    BatchResultList, ItemList, MAX_BATCH_IDS, MAX_PAGE_SIZE, item_values,
+)
+from app.crud.summary import SUMMARY_PREFIXES, TOTAL_BUCKET, prefix_bucket
 import app.crud as crud
+from app.crud.read import EXPORT_FIELDS
+from app.events import event_stream
+from app.export import ARROW_MEDIA_TYPE, ExportUnavailable, arrow_stream
+from app.idempotency import IdempotencyError, run_idempotent
+from app.tenancy import get_tenant
 
 router = APIRouter(
     prefix="/api/items",
     tags=["items"],
 )
 
+IdempotencyKeyHeader = Header(None, alias="Idempotency-Key", max_length=255)
+IfMatchHeader = Header(None, alias="If-Match")
+
+def _json_response(adapter: TypeAdapter, data) -> Response:
+    """
+    Serialize a large result in the calling worker thread.
+
+    Returning a Response skips FastAPI's response_model validation, which
+    would otherwise run on the event loop and stall every other request.
+    """
+    content = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content, media_type="application/json")
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+def _item_response(db_item, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Respond with one item straight from the column values the route already has.
+
+    Skips response_model validation of the ORM object; the item's version
+    is sent as its ETag.
+    """
+    return JSONResponse(item_values(db_item), status_code=status_code, headers={"ETag": _etag(db_item.version)})
+
+def _idempotent_response(db: Session, key: str, scope: str, payload, operation, status_code: int):
+    """Run a write once per Idempotency-Key and replay its stored response on retries."""
+    try:
+        result = run_idempotent(db, key, scope, payload, operation, status_code)
+    except IdempotencyError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    headers = {}
+    if result.replayed:
+        headers["Idempotent-Replayed"] = "true"
+    if result.etag is not None:
+        headers["ETag"] = result.etag
+    return JSONResponse(content=result.body, status_code=result.status_code, headers=headers)
+
+def _expected_version(if_match: Optional[str], body_version: Optional[int]) -> Optional[int]:
+    """The version an update requires: If-Match wins over the body's `version`, `*` means any."""
+    if if_match is None:
+        return body_version
+    tag = if_match.strip()
+    if tag == "*":
+        return None
+    if tag.startswith("W/"):
+        # If-Match uses strong comparison: a weak tag matches no version
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="If-Match needs a strong ETag")
+    tag = tag.strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be the ETag of an item version")
+    return int(tag)
+
+async def _update(db: Session, item_id: int, item, if_match: Optional[str]) -> Response:
+    expected_version = _expected_version(if_match, item.version)
+    try:
+        db_item = await point_executor.run(
+            crud.update_item, db=db, item_id=item_id, item=item, expected_version=expected_version
+        )
+    except crud.VersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Item was modified by another request",
+            headers={"ETag": _etag(e.current_version)},
+        )
+    if db_item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return _item_response(db_item)
+
 # CREATE operation
 @router.post("/", response_model=Item, status_code=status.HTTP_201_CREATED)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+async def create_item(
+    item: ItemCreate,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+):
     """Create a new item"""
-    return crud.create_item(db=db, item=item)
+    if idempotency_key is None:
+        db_item = await point_executor.run(crud.create_item, db=db, item=item)
+        return _item_response(db_item, status.HTTP_201_CREATED)
+
+    def create_and_record(record):
+        # The stored response commits with the item itself
+        db_item = crud.create_item(
+            db=db, item=item, before_commit=lambda new: record(item_values(new), _etag(new.version))
+        )
+        return item_values(db_item)
+
+    return await point_executor.run(
+        _idempotent_response,
+        db,
+        idempotency_key,
+        "POST /api/items/",
+        item.model_dump(mode="json"),
+        create_and_record,
+        status.HTTP_201_CREATED,
+    )
 
 # READ operations
 @router.get("/", response_model=List[Item])
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all items with pagination"""
-    return crud.get_items(db=db, skip=skip, limit=limit)
+async def read_items(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=0, le=MAX_PAGE_SIZE),
+    include_archived: bool = False,
+    after_id: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """Get all items with pagination, optionally including archived ones"""
+    def scan():
+        items = crud.get_items(
+            db=db, skip=skip, limit=limit, include_archived=include_archived, after_id=after_id
+        )
+        return _json_response(ItemList, items)
+    return await scan_executor.run(scan)
+
+def _batch_results(db: Session, item_ids: List[int]) -> Response:
+    items = crud.get_items_by_ids(db=db, item_ids=item_ids)
+    return _json_response(BatchResultList, [
+        {"id": item_id, "found": item is not None, "item": item}
+        for item_id, item in zip(item_ids, items)
+    ])
+
+@router.get("/batch", response_model=List[ItemBatchResult])
+async def read_items_batch(ids: str, db: Session = Depends(get_read_db)):
+    """Get many items by comma-separated IDs, in request order"""
+    try:
+        item_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+    if not item_ids or len(item_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"Between 1 and {MAX_BATCH_IDS} ids are required")
+    return await scan_executor.run(_batch_results, db, item_ids)
+
+@router.post("/batch", response_model=List[ItemBatchResult])
+async def read_items_batch_post(batch: ItemBatchRequest, db: Session = Depends(get_read_db)):
+    """Get many items by IDs sent in the request body, for lists too long for a URL"""
+    return await scan_executor.run(_batch_results, db, batch.ids)
+
+def _summary_counts(total: int, completed: int) -> SummaryCounts:
+    rate = round(completed / total, 4) if total else 0.0
+    return SummaryCounts(total=total, completed=completed, completion_rate=rate)
+
+@router.get("/summary", response_model=ItemSummary)
+async def read_summary(db: Session = Depends(get_read_db)):
+    """Get item totals and completion rates, overall and per configured title prefix"""
+    counts = await point_executor.run(crud.get_summary, db=db)
+    return ItemSummary(
+        **_summary_counts(*counts[TOTAL_BUCKET]).model_dump(),
+        prefixes={
+            prefix: _summary_counts(*counts[prefix_bucket(prefix)])
+            for prefix in SUMMARY_PREFIXES
+        },
+    )
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_items(
+    fields: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=0),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+):
+    """Stream items as Apache Arrow IPC record batches, optionally only some columns"""
+    selected = list(EXPORT_FIELDS)
+    if fields is not None:
+        selected = list(dict.fromkeys(part.strip() for part in fields.split(",") if part.strip()))
+        unknown = [name for name in selected if name not in EXPORT_FIELDS]
+        if not selected or unknown:
+            raise HTTPException(status_code=422, detail=f"fields must be a subset of {', '.join(EXPORT_FIELDS)}")
+    try:
+        stream = arrow_stream(db, selected, skip=skip, limit=limit, include_archived=include_archived)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return StreamingResponse(stream, media_type=ARROW_MEDIA_TYPE)
+
+@router.get("/changes")
+async def stream_changes(
+    request: Request,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+    tenant: str = Depends(get_tenant),
+):
+    """Stream the tenant's item create/update/delete events as Server-Sent Events"""
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    return StreamingResponse(
+        event_stream(request, resume_from, tenant),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/{item_id}", response_model=Item)
-def read_item(item_id: int, db: Session = Depends(get_db)):
+async def read_item(item_id: int, db: Session = Depends(get_read_db)):
     """Get a specific item by ID"""
-    db_item = crud.get_item(db=db, item_id=item_id)
+    db_item = await point_executor.run(crud.get_item, db=db, item_id=item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
-    return db_item
+    return _item_response(db_item)
 
-# UPDATE operation
+# UPDATE operations
 @router.put("/{item_id}", response_model=Item)
-def update_item(item_id: int, item: ItemCreate, db: Session = Depends(get_db)):
-    """Update an existing item"""
-    db_item = crud.update_item(db=db, item_id=item_id, item=item)
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return db_item
+async def update_item(
+    item_id: int,
+    item: ItemUpdate,
+    db: Session = Depends(get_db),
+    if_match: Optional[str] = IfMatchHeader,
+):
+    """Replace an existing item; with If-Match or `version`, only if it is still at that version"""
+    return await _update(db, item_id, item, if_match)
+
+@router.patch("/{item_id}", response_model=Item)
+async def patch_item(
+    item_id: int,
+    item: ItemPatch,
+    db: Session = Depends(get_db),
+    if_match: Optional[str] = IfMatchHeader,
+):
+    """Change some fields of an existing item; with If-Match or `version`, only if it is still at that version"""
+    return await _update(db, item_id, item, if_match)
 
 # DELETE operation
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_item(item_id: int, db: Session = Depends(get_db)):
     """Delete a specific item"""
-    success = crud.delete_item(db=db, item_id=item_id)
+    success = await point_executor.run(crud.delete_item, db=db, item_id=item_id)
     if not success:
         raise HTTPException(status_code=404, detail="Item not found")
-    return None
\ No newline at end of file
+    return None
+
+@router.post("/{item_id}/restore", response_model=Item)
+async def restore_item(item_id: int, db: Session = Depends(get_db)):
+    """Restore a soft-deleted item that has not been purged yet"""
+    db_item = await point_executor.run(crud.restore_item, db=db, item_id=item_id)
+    if db_item is None:
+        raise HTTPException(status_code=404, detail="Deleted item not found")
+    return db_item
\ No newline at end of file
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+
+from app.concurrency import point_executor
+from app.database import READ_YOUR_WRITES_WINDOW, tenant_sessionmakers
+from app.schemas.item import ItemCreate, ItemUpdate, item_values
+from app.tenancy import TENANT_HEADER, resolve_tenant
+import app.crud as crud
+
+router = APIRouter(tags=["items"])
+
+# Requests a single connection may have in flight before we stop reading from it
+MAX_IN_FLIGHT = int(os.getenv("WS_MAX_IN_FLIGHT", "32"))
+
+WRITE_METHODS = {"create", "update", "delete"}
+
+
+class OperationError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _item_id(params: dict) -> int:
+    item_id = params.get("item_id")
+    if not isinstance(item_id, int):
+        raise OperationError(400, "params.item_id must be an integer")
+    return item_id
+
+
+def _dispatch(method: str, params: dict, use_writer: bool, tenant: str):
+    """Run one operation against the CRUD layer in its own session (worker thread)."""
+    writer, reader = tenant_sessionmakers(tenant)
+    db = writer() if use_writer or method in WRITE_METHODS else reader()
+    try:
+        if method == "create":
+            item = ItemCreate.model_validate(params.get("item"))
+            return item_values(crud.create_item(db=db, item=item))
+
+        if method == "get":
+            db_item = crud.get_item(db=db, item_id=_item_id(params))
+            if db_item is None:
+                raise OperationError(404, "Item not found")
+            return item_values(db_item)
+
+        if method == "update":
+            item_id = _item_id(params)
+            item = ItemUpdate.model_validate(params.get("item"))
+            version = params.get("version", item.version)
+            if version is not None and not isinstance(version, int):
+                raise OperationError(400, "params.version must be an integer")
+            try:
+                db_item = crud.update_item(db=db, item_id=item_id, item=item, expected_version=version)
+            except crud.VersionConflict as e:
+                raise OperationError(412, f"Item was modified by another request (now version {e.current_version})")
+            if db_item is None:
+                raise OperationError(404, "Item not found")
+            return item_values(db_item)
+
+        if method == "delete":
+            if not crud.delete_item(db=db, item_id=_item_id(params)):
+                raise OperationError(404, "Item not found")
+            return None
+
+        raise OperationError(400, f"Unknown method: {method!r}")
+    finally:
+        db.close()
+
+
+class _Connection:
+    """Per-connection state: in-flight slots, send serialization and writer pinning."""
+
+    def __init__(self, websocket: WebSocket, tenant: str):
+        self.websocket = websocket
+        self.tenant = tenant
+        self.slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self.send_lock = asyncio.Lock()
+        self.pinned_until = 0.0
+
+    async def send(self, message: dict):
+        async with self.send_lock:
+            await self.websocket.send_text(json.dumps(message))
+
+    async def handle(self, raw: Optional[str]):
+        """Run one request and send its response; `raw` is None for a non-text frame."""
+        request_id = None
+        try:
+            if raw is None:
+                raise OperationError(400, "Binary frames are not supported; send JSON text messages")
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                raise OperationError(400, "Message is not valid JSON")
+            if not isinstance(message, dict):
+                raise OperationError(400, "Message must be a JSON object")
+
+            request_id = message.get("id")
+            method = message.get("method")
+            params = message.get("params") or {}
+            if not isinstance(params, dict):
+                raise OperationError(400, "params must be an object")
+
+            use_writer = time.monotonic() < self.pinned_until
+            if method in WRITE_METHODS and READ_YOUR_WRITES_WINDOW > 0:
+                self.pinned_until = time.monotonic() + READ_YOUR_WRITES_WINDOW
+
+            result = await point_executor.run(_dispatch, method, params, use_writer, self.tenant)
+            response = {"id": request_id, "result": result}
+        except OperationError as e:
+            response = {"id": request_id, "error": {"code": e.code, "message": e.message}}
+        except ValidationError as e:
+            response = {"id": request_id, "error": {"code": 422, "message": e.errors(include_url=False)}}
+        except Exception:
+            response = {"id": request_id, "error": {"code": 500, "message": "Internal server error"}}
+
+        try:
+            await self.send(response)
+        except (WebSocketDisconnect, RuntimeError):
+            # The client went away while the operation was running
+            pass
+        finally:
+            # Only free the slot once the response is out, so a client that
+            # does not read its responses cannot keep adding requests
+            self.slots.release()
+
+
+# WebSocket endpoint for pipelined CRUD operations
+@router.websocket("/ws/items")
+async def items_websocket(websocket: WebSocket):
+    """
+    Pipelined CRUD over a single connection.
+
+    Each message is {"id": <client id>, "method": "create|get|update|delete",
+    "params": {...}}. Operations run concurrently and each response carries
+    the request's id, so responses may arrive out of order. The tenant is
+    taken from the X-Tenant-ID header of the handshake.
+    """
+    try:
+        tenant = resolve_tenant(websocket.headers.get(TENANT_HEADER))
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+    await websocket.accept()
+    connection = _Connection(websocket, tenant)
+    tasks = set()
+    try:
+        while True:
+            # Backpressure: stop reading once MAX_IN_FLIGHT requests are pending
+            await connection.slots.acquire()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connection.slots.release()
+                break
+            task = asyncio.create_task(connection.handle(message.get("text")))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,16 +1,90 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Any, Dict, List, Optional
+
+# Longest title and description accepted; longer ones are rejected with 422
+# before the request reaches the database
+MAX_TITLE_LENGTH = 200
+MAX_DESCRIPTION_LENGTH = 10_000
 
 class ItemBase(BaseModel):
-    title: str
-    description: Optional[str] = None
+    # Strict: no coercion, so "1" is not an int and "yes" is not a bool
+    model_config = ConfigDict(strict=True)
+
+    title: str = Field(max_length=MAX_TITLE_LENGTH)
+    description: Optional[str] = Field(None, max_length=MAX_DESCRIPTION_LENGTH)
     completed: bool = False
 
 class ItemCreate(ItemBase):
     pass
 
+class ItemUpdate(ItemBase):
+    # Version the client last saw; the update fails with 412 if it has changed
+    version: Optional[int] = None
+
+class ItemPatch(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    # Only fields present in the request are written, so the None defaults
+    # never reach the database
+    title: Optional[str] = Field(None, max_length=MAX_TITLE_LENGTH)
+    description: Optional[str] = Field(None, max_length=MAX_DESCRIPTION_LENGTH)
+    completed: Optional[bool] = None
+    version: Optional[int] = None
+
+    @field_validator("title", "completed")
+    @classmethod
+    def not_null(cls, value):
+        # Runs only for fields present in the request: an absent field keeps
+        # its old value, an explicit null is rejected
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
 class Item(ItemBase):
+    # Built from database rows, which are trusted: no strictness or length checks
+    model_config = ConfigDict(from_attributes=True, strict=False)
+
+    title: str
+    description: Optional[str] = None
     id: int
+    version: int = 1
+
+# Keys of the API representation of an item, in response order
+ITEM_FIELDS = tuple(Item.model_fields)
+
+def item_values(db_item) -> Dict[str, Any]:
+    """
+    The API representation of an item, read from its loaded column values.
+
+    Cheaper than validating the ORM object into an Item: the values come
+    from the database, and all of them are plain JSON types already.
+    """
+    return {name: getattr(db_item, name) for name in ITEM_FIELDS}
+
+# Largest number of ids accepted by one batch read
+MAX_BATCH_IDS = 10000
+
+# Largest page the list endpoint returns
+MAX_PAGE_SIZE = 1000
+
+class ItemBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+class ItemBatchResult(BaseModel):
+    id: int
+    found: bool
+    item: Optional[Item] = None
+
+class SummaryCounts(BaseModel):
+    total: int
+    completed: int
+    completion_rate: float
+
+class ItemSummary(SummaryCounts):
+    # Counts for each configured title prefix
+    prefixes: Dict[str, SummaryCounts] = {}
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+# Validators and serializers for list payloads, built once at import
+# instead of per request
+ItemList = TypeAdapter(List[Item])
+BatchResultList = TypeAdapter(List[ItemBatchResult])
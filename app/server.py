@@ -0,0 +1,165 @@
+"""
+Production launcher.
+
+Runs the application with one worker process per CPU core. With gunicorn
+installed, gunicorn manages uvicorn workers and can preload the application
+so workers share imported code; otherwise uvicorn's own process manager is
+used. uvloop and httptools are used when installed.
+
+The schema is created and migrated once, in the launcher, before any
+worker starts (`--migrate` does only that and exits, for deploy scripts).
+Workers importing the application still run the migration, but under a
+file lock, where it finds nothing to do.
+
+Some state lives in each worker's memory and is not shared: the SSE
+change feed (a stream only sees writes made by its own worker), rate-limit
+buckets and in-flight caps (unless RATE_LIMIT_REDIS_URL is set), and the
+idempotency single-flight (a concurrent retry that lands on another worker
+gets 409 instead of waiting for the original). Background maintenance runs in one worker only,
+chosen by a file lock.
+
+Command line:
+    python -m app.server [--workers N] [--host HOST] [--port PORT] [--no-preload]
+    python -m app.server --migrate
+
+Development (single process, auto-reload):
+    uvicorn app.main:app --reload
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Worker processes; defaults to the number of usable CPU cores
+WEB_CONCURRENCY = os.getenv("WEB_CONCURRENCY")
+# Seconds an idle keep-alive connection stays open; keep it above the idle
+# timeout of any proxy or load balancer in front (commonly 60s)
+KEEPALIVE_TIMEOUT = int(os.getenv("KEEPALIVE_TIMEOUT", "75"))
+# Pending connections the kernel queues before refusing new ones
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+# Seconds in-flight requests get to finish on shutdown before workers are killed
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# Import the application once in the gunicorn master before forking workers
+PRELOAD = os.getenv("PRELOAD", "1") == "1"
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def default_workers() -> int:
+    """Usable CPU cores, honouring CPU affinity (e.g. container CPU sets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+LOOP = "uvloop" if _installed("uvloop") else "asyncio"
+HTTP = "httptools" if _installed("httptools") else "h11"
+
+
+if _installed("gunicorn"):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+
+    class TunedUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": LOOP, "http": HTTP}
+
+    class GunicornApplication(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+
+def _post_fork(server, worker):
+    # Connections opened in the master while preloading (create_all,
+    # migrate_schema) must not be shared with the forked workers
+    from app.database import engine, read_engine
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+
+
+def run_gunicorn(workers: int, host: str, port: int, preload: bool):
+    GunicornApplication({
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "app.server.TunedUvicornWorker",
+        "keepalive": KEEPALIVE_TIMEOUT,
+        "backlog": BACKLOG,
+        "graceful_timeout": GRACEFUL_TIMEOUT,
+        "preload_app": preload,
+        "post_fork": _post_fork,
+        "accesslog": None,
+    }).run()
+
+
+def run_uvicorn(workers: int, host: str, port: int):
+    import uvicorn
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=LOOP,
+        http=HTTP,
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+        backlog=BACKLOG,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        access_log=False,
+    )
+
+
+def migrate():
+    """Create and migrate the database, then close the launcher's connections."""
+    from app.database import engine, prepare_database, read_engine
+    prepare_database()
+    # Workers open their own connections
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Run the application with multiple worker processes")
+    parser.add_argument("--workers", type=int, default=int(WEB_CONCURRENCY) if WEB_CONCURRENCY else default_workers())
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=PRELOAD)
+    parser.add_argument("--migrate", action="store_true", help="Create and migrate the database, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    migrate()
+    if args.migrate:
+        logger.info("Database is up to date")
+        return
+    use_gunicorn = _installed("gunicorn")
+    logger.info(
+        "Starting %d worker(s) with %s (loop=%s, http=%s)",
+        args.workers, "gunicorn" if use_gunicorn else "uvicorn", LOOP, HTTP,
+    )
+    if use_gunicorn:
+        run_gunicorn(args.workers, args.host, args.port, args.preload)
+    else:
+        run_uvicorn(args.workers, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
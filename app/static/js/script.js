@@ -21,17 +21,60 @@ const toast = new bootstrap.Toast(toastElement, {
     delay: 3000
 });
 
-// API Endpoints
-const API_URL = '/api/items';
+// API Endpoints, under the path prefix the page was served from
+const API_URL = `${document.body.dataset.rootPath || ''}/api/items`;
+const CHANGES_URL = `${API_URL}/changes`;
+
+// List loading and rendering
+const PAGE_SIZE = 200;          // Items per request while scrolling
+const ROW_HEIGHT = 48;          // Fixed row height in px, kept in sync with styles.css
+const OVERSCAN_ROWS = 10;       // Rows rendered above and below the visible ones
+const PREFETCH_ROWS = 50;       // Load the next page this many rows before the end
+
+const itemsViewport = document.getElementById('items-viewport');
+const itemsCount = document.getElementById('items-count');
 
 // App State
 let isEditing = false;
-let items = [];
+let items = [];                 // Loaded items, sorted by id
+let nextAfterId = null;         // Cursor for the next page; null before the first one
+let hasMore = true;
+let isFetching = false;
+let queuedChanges = [];
+let listGeneration = 0;         // Bumped on reload so stale page responses are dropped
+
+// Only the rows in the visible window exist in the DOM, between two spacer rows
+const topSpacer = createSpacerRow();
+const bottomSpacer = createSpacerRow();
+const renderedRows = new Map(); // item id -> <tr>
+let renderedRange = { start: 0, end: 0 };
+let renderScheduled = false;
 
 // Event Listeners
-document.addEventListener('DOMContentLoaded', fetchItems);
+document.addEventListener('DOMContentLoaded', () => {
+    subscribeToChanges();
+    fetchItems();
+});
 itemForm.addEventListener('submit', handleFormSubmit);
 cancelBtn.addEventListener('click', resetForm);
+itemsViewport.addEventListener('scroll', () => scheduleRender(), { passive: true });
+window.addEventListener('resize', () => scheduleRender(true));
+// One listener for every row's buttons, so rows can be recycled freely
+itemsTableBody.addEventListener('click', event => {
+    const button = event.target.closest('.action-btn');
+    if (!button) {
+        return;
+    }
+    const itemId = parseInt(button.dataset.id);
+    if (button.classList.contains('edit-btn')) {
+        const item = items[findItemIndex(itemId)];
+        if (item && item.id === itemId) {
+            editItem(item);
+        }
+    } else if (button.classList.contains('delete-btn')) {
+        deleteItem(itemId);
+    }
+});
 if (createFirstItemBtn) {
     createFirstItemBtn.addEventListener('click', () => {
         window.scrollTo({
@@ -43,72 +86,255 @@ if (createFirstItemBtn) {
 }
 
 // Functions
-async function fetchItems() {
+
+// (Re)load the list from the start
+function fetchItems() {
+    listGeneration++;
+    items = [];
+    nextAfterId = null;
+    hasMore = true;
+    isFetching = false;
+    queuedChanges = [];
+    renderedRows.clear();
+    itemsViewport.scrollTop = 0;
+    scheduleRender(true);
+    return fetchNextPage();
+}
+
+// Load the page after the last one, keyed by id so deletes never shift it
+async function fetchNextPage() {
+    if (isFetching || !hasMore) {
+        return;
+    }
+    const generation = listGeneration;
     try {
+        isFetching = true;
         showLoading(true);
-        const response = await fetch(API_URL);
-        const data = await response.json();
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (nextAfterId !== null) {
+            params.set('after_id', nextAfterId);
+        }
+        const response = await fetch(`${API_URL}/?${params}`);
+        if (!response.ok) {
+            throw new Error(`Failed to load items (${response.status})`);
+        }
+        const page = await response.json();
+        if (generation !== listGeneration) {
+            return;
+        }
         
-        // Keep a reference to all items
-        items = data;
+        mergePage(page);
+        hasMore = page.length === PAGE_SIZE;
+        if (page.length > 0) {
+            nextAfterId = page[page.length - 1].id;
+        }
+        
+        // Apply changes that arrived while the page was loading
+        isFetching = false;
+        queuedChanges.forEach(change => applyChange(change.type, change.data));
+        queuedChanges = [];
         
-        renderItems(items);
         showLoading(false);
+        scheduleRender(true);
     } catch (error) {
+        if (generation !== listGeneration) {
+            return;
+        }
         console.error('Error fetching items:', error);
         showToast('Error', 'Failed to load items. Please try again.', 'error');
+        isFetching = false;
         showLoading(false);
     }
 }
 
-function renderItems(items) {
-    itemsTableBody.innerHTML = '';
+function mergePage(page) {
+    // Pages normally start after everything loaded so far
+    if (items.length === 0 || page.length === 0 || page[0].id > items[items.length - 1].id) {
+        items.push(...page);
+        return;
+    }
+    page.forEach(item => upsertItem(item));
+}
+
+// Keep the list in sync from the server's change feed instead of refetching it
+function subscribeToChanges() {
+    if (!window.EventSource) {
+        return;
+    }
+    
+    const source = new EventSource(CHANGES_URL);
+    
+    ['create', 'update', 'delete'].forEach(type => {
+        source.addEventListener(type, event => {
+            const data = JSON.parse(event.data);
+            if (isFetching) {
+                queuedChanges.push({ type, data });
+                return;
+            }
+            applyChange(type, data);
+        });
+    });
+    
+    // The server could not replay what we missed, so reload the list
+    source.addEventListener('reset', () => fetchItems());
+}
+
+function applyChange(type, data) {
+    if (type === 'delete') {
+        removeItem(data.id);
+    } else {
+        upsertItem(data);
+    }
+}
+
+// Position of `itemId` in the sorted list, or where it would be inserted
+function findItemIndex(itemId) {
+    let low = 0;
+    let high = items.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (items[middle].id < itemId) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+function upsertItem(item) {
+    const index = findItemIndex(item.id);
+    const existing = items[index];
+    if (existing && existing.id === item.id) {
+        // The feed and our own responses can arrive in either order
+        if (existing.version > item.version) {
+            return;
+        }
+        items[index] = item;
+        patchRow(item);
+        return;
+    }
+    // Ids past the loaded pages arrive with a later page
+    if (hasMore && nextAfterId !== null && item.id > nextAfterId) {
+        return;
+    }
+    items.splice(index, 0, item);
+    scheduleRender(true);
+}
+
+function removeItem(itemId) {
+    const index = findItemIndex(itemId);
+    if (items[index] && items[index].id === itemId) {
+        items.splice(index, 1);
+        renderedRows.delete(itemId);
+        scheduleRender(true);
+    }
+}
+
+// Redraw the row of an item in place when it is on screen
+function patchRow(item) {
+    const row = renderedRows.get(item.id);
+    if (row) {
+        fillRow(row, item);
+    }
+}
+
+function scheduleRender(force = false) {
+    if (force) {
+        renderedRange = { start: 0, end: 0 };
+    }
+    if (!renderScheduled) {
+        renderScheduled = true;
+        requestAnimationFrame(renderItems);
+    }
+}
+
+// Render only the rows in (and just around) the scrolled-to part of the list
+function renderItems() {
+    renderScheduled = false;
+    itemsCount.textContent = hasMore ? `${items.length}+` : `${items.length}`;
     
     if (items.length === 0) {
-        noItemsMessage.style.display = 'block';
-        document.querySelector('.table-responsive').style.display = 'none';
+        itemsTableBody.replaceChildren();
+        renderedRows.clear();
+        itemsViewport.style.display = 'none';
+        noItemsMessage.style.display = isFetching || hasMore ? 'none' : 'block';
         return;
     }
     
     noItemsMessage.style.display = 'none';
-    document.querySelector('.table-responsive').style.display = 'block';
+    itemsViewport.style.display = 'block';
     
-    items.forEach(item => {
-        const row = document.createElement('tr');
-        row.id = `item-row-${item.id}`;
-        
-        row.innerHTML = `
-            <td>${item.id}</td>
-            <td class="fw-medium">${escapeHtml(item.title)}</td>
-            <td>${escapeHtml(item.description || '-')}</td>
-            <td>
-                <span class="badge completed-${item.completed}">
-                    ${item.completed ? 
-                      '<i class="bi bi-check-circle me-1"></i>Completed' : 
-                      '<i class="bi bi-clock me-1"></i>Pending'}
-                </span>
-            </td>
-            <td class="text-center">
-                <div class="d-flex justify-content-center">
-                    <button class="action-btn edit-btn" data-id="${item.id}" title="Edit Item">
-                        <i class="bi bi-pencil-square"></i>
-                    </button>
-                    <button class="action-btn delete-btn" data-id="${item.id}" title="Delete Item">
-                        <i class="bi bi-trash"></i>
-                    </button>
-                </div>
-            </td>
-        `;
-        
-        itemsTableBody.appendChild(row);
-        
-        // Add event listeners to buttons
-        const editBtn = row.querySelector('.edit-btn');
-        const deleteBtn = row.querySelector('.delete-btn');
-        
-        editBtn.addEventListener('click', () => editItem(item));
-        deleteBtn.addEventListener('click', () => deleteItem(item.id));
-    });
+    const headerHeight = itemsTableBody.parentElement.tHead.offsetHeight;
+    const scrollTop = Math.max(0, itemsViewport.scrollTop - headerHeight);
+    const first = Math.floor(scrollTop / ROW_HEIGHT);
+    const visible = Math.ceil(itemsViewport.clientHeight / ROW_HEIGHT);
+    const start = Math.max(0, first - OVERSCAN_ROWS);
+    const end = Math.min(items.length, first + visible + OVERSCAN_ROWS);
+    
+    if (end >= items.length - PREFETCH_ROWS) {
+        fetchNextPage();
+    }
+    if (start === renderedRange.start && end === renderedRange.end) {
+        return;
+    }
+    renderedRange = { start, end };
+    
+    // Reuse the rows still in the window; build only the ones scrolled into view
+    const rows = [];
+    const windowRows = new Map();
+    for (let i = start; i < end; i++) {
+        const item = items[i];
+        let row = renderedRows.get(item.id);
+        if (!row) {
+            row = document.createElement('tr');
+            fillRow(row, item);
+        }
+        windowRows.set(item.id, row);
+        rows.push(row);
+    }
+    renderedRows.clear();
+    windowRows.forEach((row, itemId) => renderedRows.set(itemId, row));
+    
+    topSpacer.firstChild.style.height = `${start * ROW_HEIGHT}px`;
+    bottomSpacer.firstChild.style.height = `${(items.length - end) * ROW_HEIGHT}px`;
+    itemsTableBody.replaceChildren(topSpacer, ...rows, bottomSpacer);
+}
+
+function createSpacerRow() {
+    const row = document.createElement('tr');
+    row.className = 'virtual-spacer';
+    row.setAttribute('aria-hidden', 'true');
+    const cell = document.createElement('td');
+    cell.colSpan = 5;
+    row.appendChild(cell);
+    return row;
+}
+
+function fillRow(row, item) {
+    row.id = `item-row-${item.id}`;
+    row.innerHTML = `
+        <td>${item.id}</td>
+        <td class="fw-medium" title="${escapeHtml(item.title)}">${escapeHtml(item.title)}</td>
+        <td title="${escapeHtml(item.description || '')}">${escapeHtml(item.description || '-')}</td>
+        <td>
+            <span class="badge completed-${item.completed}">
+                ${item.completed ? 
+                  '<i class="bi bi-check-circle me-1"></i>Completed' : 
+                  '<i class="bi bi-clock me-1"></i>Pending'}
+            </span>
+        </td>
+        <td class="text-center">
+            <div class="d-flex justify-content-center">
+                <button class="action-btn edit-btn" data-id="${item.id}" title="Edit Item">
+                    <i class="bi bi-pencil-square"></i>
+                </button>
+                <button class="action-btn delete-btn" data-id="${item.id}" title="Delete Item">
+                    <i class="bi bi-trash"></i>
+                </button>
+            </div>
+        </td>
+    `;
 }
 
 async function handleFormSubmit(event) {
@@ -129,19 +355,23 @@ async function handleFormSubmit(event) {
     try {
         showLoading(true);
         
+        let savedItem;
         if (isEditing) {
             // Update existing item
             const itemId = parseInt(itemIdInput.value);
-            await updateItem(itemId, itemData);
+            savedItem = await updateItem(itemId, itemData);
             showToast('Success', 'Item updated successfully!', 'success');
         } else {
             // Create new item
-            await createItem(itemData);
+            savedItem = await createItem(itemData);
             showToast('Success', 'New item created successfully!', 'success');
         }
         
+        // Apply our own change right away; the feed event for it is idempotent
+        upsertItem(savedItem);
+        
         resetForm();
-        fetchItems();
+        showLoading(false);
     } catch (error) {
         console.error('Error saving item:', error);
         showToast('Error', 'Failed to save item. Please try again.', 'error');
@@ -150,7 +380,7 @@ async function handleFormSubmit(event) {
 }
 
 async function createItem(itemData) {
-    const response = await fetch(API_URL, {
+    const response = await fetch(`${API_URL}/`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -203,11 +433,8 @@ async function deleteItem(itemId) {
         
         showToast('Success', 'Item deleted successfully!', 'success');
         
-        // Remove item from local array
-        items = items.filter(item => item.id !== itemId);
-        
-        // Re-render items
-        renderItems(items);
+        // Remove the item's row; the rows below it move up
+        removeItem(itemId);
         showLoading(false);
     } catch (error) {
         console.error('Error deleting item:', error);
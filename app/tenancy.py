@@ -0,0 +1,161 @@
+"""
+Tenant resolution and automatic tenant scoping.
+
+Every request belongs to a tenant, named by the X-Tenant-ID header
+(DEFAULT_TENANT when it is absent). Sessions carry the tenant in
+`session.info["tenant_id"]`; the session events below add
+`tenant_id = <tenant>` wherever a tenant-owned model appears in a
+statement (SELECT, UPDATE, DELETE and INSERT ... FROM SELECT) and stamp
+it on new rows, so the CRUD functions never filter by
+tenant themselves. Sessions without a tenant (maintenance, admin tasks)
+see every tenant.
+
+With TENANT_DATABASES=1 each tenant also gets its own SQLite file under
+TENANT_DATABASE_DIR, so busy tenants do not wait on one another's write
+lock. At most TENANT_ENGINE_CACHE tenants keep their engines open; the
+least recently used one is closed to make room.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import Column, String, event
+from sqlalchemy.orm import Session, with_loader_criteria
+
+TENANT_HEADER = "X-Tenant-ID"
+# Tenant of requests without the header (and of rows written before tenants existed)
+DEFAULT_TENANT = os.getenv("DEFAULT_TENANT", "default")
+# Give each tenant its own SQLite database file
+TENANT_DATABASES = os.getenv("TENANT_DATABASES", "0") == "1"
+TENANT_DATABASE_DIR = os.getenv("TENANT_DATABASE_DIR", "./database/tenants")
+# Tenants whose engines stay open in TENANT_DATABASES mode
+TENANT_ENGINE_CACHE = int(os.getenv("TENANT_ENGINE_CACHE", "32"))
+
+# Also used as a file name, so no dots or slashes
+_TENANT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class TenantScoped:
+    """Mixin for models whose rows belong to one tenant."""
+
+    tenant_id = Column(String, nullable=False, default=DEFAULT_TENANT, server_default=DEFAULT_TENANT)
+
+
+def resolve_tenant(value: Optional[str]) -> str:
+    """Validate a tenant id from a request; raises 400 for malformed ids."""
+    if value is None or value == "":
+        return DEFAULT_TENANT
+    if not _TENANT_ID.match(value):
+        raise HTTPException(
+            status_code=400,
+            detail=f"{TENANT_HEADER} must be 1-64 letters, digits, '_' or '-'",
+        )
+    return value
+
+
+async def get_tenant(request: Request) -> str:
+    """Dependency returning the tenant of the current request."""
+    return resolve_tenant(request.headers.get(TENANT_HEADER))
+
+
+def session_tenant(db: Session) -> Optional[str]:
+    """Tenant a session is scoped to, None for unscoped sessions."""
+    return db.info.get("tenant_id")
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _scope_to_tenant(execute_state):
+    tenant = session_tenant(execute_state.session)
+    if tenant is None or execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete or execute_state.is_insert:
+        # Applies to the entity wherever it appears, including subqueries,
+        # unions and the SELECT of an INSERT ... FROM SELECT
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(TenantScoped, lambda cls: cls.tenant_id == tenant, include_aliases=True)
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_tenant(session, flush_context, instances):
+    tenant = session_tenant(session)
+    if tenant is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, TenantScoped) and obj.tenant_id is None:
+            obj.tenant_id = tenant
+
+
+class TenantEnginePool:
+    """
+    Least-recently-used cache of per-tenant database handles.
+
+    `open_tenant(tenant)` creates the handle on first use; `close(handle)`
+    releases it when the tenant is evicted. Sessions already using an
+    evicted tenant's engine keep working; their connections are closed
+    when returned.
+    """
+
+    def __init__(self, open_tenant: Callable[[str], Any], close: Callable[[Any], None], size: int):
+        self._open = open_tenant
+        self._close = close
+        self.size = size
+        self._lock = threading.Lock()
+        self._handles: "OrderedDict[str, Any]" = OrderedDict()
+        # One lock per tenant being opened, so a slow open (creating or
+        # migrating its file) only holds up requests for that tenant
+        self._opening: Dict[str, threading.Lock] = {}
+        self.opened = 0
+        self.evicted = 0
+
+    def _cached(self, tenant: str):
+        # Call with self._lock held
+        handle = self._handles.get(tenant)
+        if handle is not None:
+            self._handles.move_to_end(tenant)
+        return handle
+
+    def get(self, tenant: str):
+        with self._lock:
+            handle = self._cached(tenant)
+            if handle is not None:
+                return handle
+            opening = self._opening.setdefault(tenant, threading.Lock())
+        with opening:
+            with self._lock:
+                # Another thread may have opened it while this one waited
+                handle = self._cached(tenant)
+            if handle is not None:
+                return handle
+            handle = self._open(tenant)
+            with self._lock:
+                self._opening.pop(tenant, None)
+                self._handles[tenant] = handle
+                self.opened += 1
+                evicted: List[Tuple[str, Any]] = []
+                while len(self._handles) > self.size:
+                    evicted.append(self._handles.popitem(last=False))
+        for _, old in evicted:
+            self.evicted += 1
+            self._close(old)
+        return handle
+
+    def open_tenants(self) -> Dict[str, Any]:
+        """Handles currently open, without changing their recency."""
+        with self._lock:
+            return dict(self._handles)
+
+    def close_all(self):
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            self._close(handle)
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {"open": len(self._handles), "size": self.size, "opened": self.opened, "evicted": self.evicted}
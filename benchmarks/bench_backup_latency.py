@@ -0,0 +1,94 @@
+"""
+Benchmark API latency while a hot backup is running.
+
+Starts a server on a temporary, seeded SQLite database and keeps `clients`
+concurrent clients busy with point reads and updates. Latency percentiles
+are measured once with no backup running and once while backups are taken
+back to back through POST /api/admin/backup.
+
+Usage:
+    python -m benchmarks.bench_backup_latency [rows] [seconds] [clients]
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+
+from app.database import create_writer_engine
+from benchmarks.seed import seed_items
+from benchmarks.server import running_server
+
+PORT = 8766
+ADMIN_HEADERS = {"X-Admin-Token": "bench"}
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+async def _load(client: httpx.AsyncClient, rows: int, stop: asyncio.Event, latencies: list, offset: int):
+    n = offset
+    while not stop.is_set():
+        item_id = n * 7919 % rows + 1
+        start = time.perf_counter()
+        if n % 5 == 0:
+            response = await client.put(f"/api/items/{item_id}", json={"title": f"Task {item_id}", "completed": True})
+        else:
+            response = await client.get(f"/api/items/{item_id}")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        n += 1
+
+async def _run_backups(client: httpx.AsyncClient, stop: asyncio.Event) -> int:
+    completed = 0
+    while not stop.is_set():
+        job = (await client.post("/api/admin/backup", headers=ADMIN_HEADERS)).json()
+        while not stop.is_set():
+            status = (await client.get(f"/api/admin/backup/{job['id']}", headers=ADMIN_HEADERS)).json()
+            if status["status"] == "completed":
+                completed += 1
+                break
+            if status["status"] == "failed":
+                raise RuntimeError(status["error"])
+            await asyncio.sleep(0.05)
+    return completed
+
+async def _measure(base_url: str, rows: int, seconds: float, clients: int, with_backup: bool):
+    latencies = []
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        tasks = [asyncio.create_task(_load(client, rows, stop, latencies, i)) for i in range(clients)]
+        backup_task = asyncio.create_task(_run_backups(client, stop)) if with_backup else None
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+        backups_done = await backup_task if backup_task else 0
+    return latencies, backups_done
+
+def main(rows: int = 200_000, seconds: float = 10, clients: int = 8):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{tmpdir}/items.db"
+        seed_items(create_writer_engine(url), rows)
+        env = {"ADMIN_TOKEN": "bench", "BACKUP_DIR": f"{tmpdir}/backups"}
+        with running_server(url, PORT, env=env) as base_url:
+            print(f"{rows} rows, {clients} clients (80% point reads, 20% updates), {seconds:.0f}s per phase\n")
+            print(f"{'phase':<22}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}{'backups':>10}")
+            for name, with_backup in (("no backup", False), ("backup running", True)):
+                latencies, backups_done = asyncio.run(_measure(base_url, rows, seconds, clients, with_backup))
+                print(
+                    f"{name:<22}{len(latencies):>10}{_percentile(latencies, 0.5):>10.2f}"
+                    f"{_percentile(latencies, 0.99):>10.2f}{backups_done:>10}"
+                )
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 8,
+    )
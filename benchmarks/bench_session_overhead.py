@@ -0,0 +1,67 @@
+"""
+Benchmark the per-request cost of the database session lifecycle.
+
+"before" is the original setup: an eager, transactional SessionLocal() per
+request on a default engine. "after" is the current one: a LazySession over
+the tuned pool, with reads on the autocommit read-only engine.
+
+Usage:
+    python -m benchmarks.bench_session_overhead [iterations]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import LazySession, create_reader_engine, create_writer_engine
+from app.crud.read import get_item
+from benchmarks.seed import seed_items
+
+def _time_per_request(open_session, work, iterations: int, repeats: int = 5) -> float:
+    # Best of `repeats` runs, to keep scheduler noise out of the comparison
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for n in range(iterations):
+            db = open_session()
+            try:
+                work(db, n)
+            finally:
+                db.close()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1_000_000
+
+def main(iterations: int = 2000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{tmpdir}/items.db"
+        writer = create_writer_engine(url)
+        seed_items(writer, 10_000)
+
+        before_engine = create_engine(url, connect_args={"check_same_thread": False})
+        BeforeSession = sessionmaker(autocommit=False, autoflush=False, bind=before_engine)
+        AfterSession = sessionmaker(
+            autocommit=False, autoflush=False, bind=create_reader_engine(url, writer)
+        )
+
+        scenarios = {
+            "no database access (e.g. 422)": lambda db, n: None,
+            "point read (hit)": lambda db, n: get_item(db, n % 10_000 + 1),
+            "point read (404)": lambda db, n: get_item(db, 10_000_000 + n),
+        }
+
+        print(f"Per-request session overhead, {iterations} iterations (µs/request)\n")
+        print(f"{'scenario':<32}{'before':>10}{'after':>10}")
+        for name, work in scenarios.items():
+            before = _time_per_request(BeforeSession, work, iterations)
+            after = _time_per_request(lambda: LazySession(AfterSession), work, iterations)
+            print(f"{name:<32}{before:>10.1f}{after:>10.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
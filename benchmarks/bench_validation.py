@@ -0,0 +1,173 @@
+"""
+Benchmark request validation and response building for item writes.
+
+"before" is the original setup: lax ItemCreate without length limits, and
+responses validated from the refreshed ORM object through `from_attributes`.
+"after" is the current one: strict, length-limited schemas, precompiled
+TypeAdapters for list payloads, and responses built from column values.
+
+Usage:
+    python -m benchmarks.bench_validation [iterations]
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+from typing import List, Optional
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SESSION_OPTIONS, create_writer_engine
+from app.crud.create import create_item
+from app.crud.update import update_item
+from app.models.item import Item as ItemModel
+from app.schemas.item import ItemCreate, ItemList, ItemPatch, MAX_TITLE_LENGTH, item_values
+
+class LegacyItemCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    completed: bool = False
+
+class UnlimitedItemCreate(LegacyItemCreate):
+    # The current strictness without the length limits, to price the limits
+    model_config = ConfigDict(strict=True)
+
+class LegacyItem(LegacyItemCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    version: int = 1
+
+def _ops_per_second(work, iterations: int, repeats: int = 5) -> float:
+    # Best of `repeats` runs, to keep scheduler noise out of the comparison
+    return _compare(work, iterations=iterations, repeats=repeats)[0]
+
+def _compare(*works, iterations: int, repeats: int = 15) -> List[float]:
+    """Best-of-`repeats` rates of several operations, measured in alternating runs."""
+    # Alternating keeps drift in CPU frequency or background load from
+    # favouring whichever operation happened to run first
+    best = [float("inf")] * len(works)
+    for _ in range(repeats):
+        for n, work in enumerate(works):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                work()
+            best[n] = min(best[n], time.perf_counter() - start)
+    return [iterations / elapsed for elapsed in best]
+
+def _payload(n: int) -> dict:
+    return {"title": f"Item {n}", "description": f"Description of item {n}", "completed": n % 2 == 0}
+
+def _write_round_trips(iterations: int):
+    """Create and update through the CRUD layer, then build the response body."""
+    legacy_response = TypeAdapter(LegacyItem)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_writer_engine(f"sqlite:///{tmpdir}/items.db")
+        Base.metadata.create_all(engine)
+        # before: objects expire on commit and the response reloads them
+        Before = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+        After = sessionmaker(bind=engine, **SESSION_OPTIONS)
+
+        def before_create():
+            with Before() as db:
+                db_item = create_item(db, LegacyItemCreate.model_validate(_payload(1)))
+                json.dumps(legacy_response.dump_python(
+                    legacy_response.validate_python(db_item, from_attributes=True), mode="json"
+                ))
+
+        def after_create():
+            with After() as db:
+                json.dumps(item_values(create_item(db, ItemCreate.model_validate(_payload(1)))))
+
+        def before_update():
+            with Before() as db:
+                db_item = update_item(db, 1, LegacyItemCreate.model_validate(_payload(2)))
+                json.dumps(legacy_response.dump_python(
+                    legacy_response.validate_python(db_item, from_attributes=True), mode="json"
+                ))
+
+        def after_update():
+            with After() as db:
+                json.dumps(item_values(update_item(db, 1, ItemPatch.model_validate(_payload(2)))))
+
+        print(f"\nWrites through the CRUD layer, file-backed SQLite, best of 5 alternating runs x {iterations} (operations/sec)\n")
+        print(f"{'operation':<44}{'before':>12}{'after':>12}")
+        for name, before, after in (
+            ("create + response", before_create, after_create),
+            ("update + response", before_update, after_update),
+        ):
+            before_rate, after_rate = _compare(before, after, iterations=iterations, repeats=5)
+            print(f"{name:<44}{before_rate:>12,.0f}{after_rate:>12,.0f}")
+        engine.dispose()
+
+def main(iterations: int = 20000):
+    payload = _payload(1)
+    body = json.dumps(payload).encode()
+    legacy_response = TypeAdapter(LegacyItem)
+    db_item = ItemModel(id=1, version=1, **payload)
+
+    print(f"Single payloads, best of 15 alternating runs x {iterations} (operations/sec)\n")
+    print(f"{'operation':<44}{'before':>12}{'after':>12}")
+    rows = {
+        "validate parsed JSON (FastAPI body)": (
+            lambda: LegacyItemCreate.model_validate(payload),
+            lambda: ItemCreate.model_validate(payload),
+        ),
+        "validate raw JSON bytes": (
+            lambda: LegacyItemCreate.model_validate_json(body),
+            lambda: ItemCreate.model_validate_json(body),
+        ),
+        "build response from ORM object": (
+            lambda: json.dumps(legacy_response.dump_python(
+                legacy_response.validate_python(db_item, from_attributes=True), mode="json"
+            )),
+            lambda: json.dumps(item_values(db_item)),
+        ),
+    }
+    for name, (before, after) in rows.items():
+        before_rate, after_rate = _compare(before, after, iterations=iterations)
+        print(f"{name:<44}{before_rate:>12,.0f}{after_rate:>12,.0f}")
+
+    unlimited_rate, limited_rate = _compare(
+        lambda: UnlimitedItemCreate.model_validate(payload),
+        lambda: ItemCreate.model_validate(payload),
+        iterations=iterations,
+    )
+    print(f"\nStrict parsed-body validation without / with length limits: {unlimited_rate:,.0f} / {limited_rate:,.0f} ops/sec")
+
+    oversized = {"title": "x" * 1_000_000}
+
+    def reject():
+        try:
+            ItemCreate.model_validate(oversized)
+        except ValueError:
+            pass
+
+    print(f"\nReject a 1 MB title (limit {MAX_TITLE_LENGTH}): {_ops_per_second(reject, iterations // 10):,.0f} ops/sec")
+
+    print("\nBatched payloads (items/sec)\n")
+    print(f"{'batch':>8}{'per-item loop':>16}{'new adapter':>14}{'precompiled':>14}{'list response':>16}")
+    for size in (10, 100, 1000):
+        batch = [_payload(n) for n in range(size)]
+        batch_body = json.dumps(batch).encode()
+        db_items = [ItemModel(id=n + 1, version=1, **item) for n, item in enumerate(batch)]
+        precompiled = TypeAdapter(List[ItemCreate])
+        runs = max(iterations // size, 20)
+        loop = _ops_per_second(lambda: [ItemCreate.model_validate(item) for item in json.loads(batch_body)], runs)
+        fresh = _ops_per_second(lambda: TypeAdapter(List[ItemCreate]).validate_json(batch_body), runs)
+        compiled = _ops_per_second(lambda: precompiled.validate_json(batch_body), runs)
+        listed = _ops_per_second(
+            lambda: ItemList.dump_json(ItemList.validate_python(db_items, from_attributes=True)), runs
+        )
+        print(f"{size:>8}{loop * size:>16,.0f}{fresh * size:>14,.0f}{compiled * size:>14,.0f}{listed * size:>16,.0f}")
+
+    _write_round_trips(max(iterations // 20, 100))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
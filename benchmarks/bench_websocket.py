@@ -0,0 +1,105 @@
+"""
+Benchmark pipelined CRUD over /ws/items against the REST routes.
+
+Starts a uvicorn server on a temporary, seeded SQLite database and runs the
+same mix of point reads and updates three ways: sequential REST requests on
+a keep-alive connection, concurrent REST requests, and a single WebSocket
+with up to `window` requests in flight.
+
+Usage:
+    python -m benchmarks.bench_websocket [operations] [window]
+
+Requires the `websockets` package (also needed by uvicorn to serve /ws/items).
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import time
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+import websockets
+
+from app.database import create_writer_engine
+from benchmarks.seed import seed_items
+from benchmarks.server import running_server
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+SEEDED = 1000
+
+def _operation(n: int):
+    """Every fourth operation is an update, the rest are point reads."""
+    item_id = n % SEEDED + 1
+    if n % 4 == 0:
+        return "update", item_id, {"title": f"Task {item_id}", "description": f"rev {n}", "completed": n % 8 == 0}
+    return "get", item_id, None
+
+def bench_rest_sequential(operations: int) -> float:
+    with httpx.Client(base_url=BASE_URL) as client:
+        start = time.perf_counter()
+        for n in range(operations):
+            method, item_id, body = _operation(n)
+            if method == "update":
+                client.put(f"/api/items/{item_id}", json=body).raise_for_status()
+            else:
+                client.get(f"/api/items/{item_id}").raise_for_status()
+        return operations / (time.perf_counter() - start)
+
+async def bench_rest_concurrent(operations: int, window: int) -> float:
+    limits = httpx.Limits(max_connections=window, max_keepalive_connections=window)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits) as client:
+        slots = asyncio.Semaphore(window)
+
+        async def run(n):
+            async with slots:
+                method, item_id, body = _operation(n)
+                if method == "update":
+                    response = await client.put(f"/api/items/{item_id}", json=body)
+                else:
+                    response = await client.get(f"/api/items/{item_id}")
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run(n) for n in range(operations)))
+        return operations / (time.perf_counter() - start)
+
+async def bench_websocket(operations: int, window: int) -> float:
+    async with websockets.connect(f"ws://127.0.0.1:{PORT}/ws/items", max_queue=None) as ws:
+        start = time.perf_counter()
+        sent = received = 0
+        while received < operations:
+            while sent < operations and sent - received < window:
+                method, item_id, body = _operation(sent)
+                params = {"item_id": item_id}
+                if body is not None:
+                    params["item"] = body
+                await ws.send(json.dumps({"id": sent, "method": method, "params": params}))
+                sent += 1
+            response = json.loads(await ws.recv())
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            received += 1
+        return operations / (time.perf_counter() - start)
+
+def main(operations: int = 2000, window: int = 16):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{tmpdir}/items.db"
+        seed_items(create_writer_engine(url), SEEDED)
+        with running_server(url, PORT):
+            print(f"{operations} operations (75% point reads, 25% updates), window {window}\n")
+            print(f"{'transport':<28}{'ops/sec':>10}")
+            print(f"{'REST sequential':<28}{bench_rest_sequential(operations):>10.0f}")
+            print(f"{'REST concurrent':<28}{asyncio.run(bench_rest_concurrent(operations, window)):>10.0f}")
+            print(f"{'WebSocket pipelined':<28}{asyncio.run(bench_websocket(operations, window)):>10.0f}")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+    )
@@ -0,0 +1,83 @@
+"""
+Benchmark throughput with one worker process against several.
+
+Starts the production launcher (app.server) on a temporary, seeded SQLite
+database, first with a single worker and then with `workers` workers, and
+keeps `clients` concurrent clients busy with point reads, list pages and
+updates for `seconds` per run.
+
+Usage:
+    python -m benchmarks.bench_workers [workers] [rows] [seconds] [clients]
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+
+from app.database import create_writer_engine
+from app.server import HTTP, LOOP, default_workers
+from benchmarks.seed import seed_items
+from benchmarks.server import running_server
+
+PORT = 8767
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+async def _client(client: httpx.AsyncClient, rows: int, stop: asyncio.Event, latencies: list, offset: int):
+    n = offset
+    while not stop.is_set():
+        item_id = n * 7919 % rows + 1
+        start = time.perf_counter()
+        if n % 10 == 0:
+            response = await client.put(f"/api/items/{item_id}", json={"title": f"Task {item_id}", "completed": False})
+        elif n % 10 == 1:
+            response = await client.get("/api/items/", params={"skip": item_id, "limit": 50})
+        else:
+            response = await client.get(f"/api/items/{item_id}")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        n += 1
+
+async def _measure(base_url: str, rows: int, seconds: float, clients: int):
+    latencies = []
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        tasks = [asyncio.create_task(_client(client, rows, stop, latencies, i)) for i in range(clients)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return latencies
+
+def main(workers: int = default_workers(), rows: int = 100_000, seconds: float = 10, clients: int = 32):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{tmpdir}/items.db"
+        seed_items(create_writer_engine(url), rows)
+        print(f"{rows} rows, {clients} clients (80% point reads, 10% list pages, 10% updates), {seconds:.0f}s per run")
+        print(f"{default_workers()} CPU cores, loop={LOOP}, http={HTTP}\n")
+        print(f"{'workers':<10}{'req/sec':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for count in dict.fromkeys((1, workers)):
+            command = [sys.executable, "-m", "app.server", "--workers", str(count), "--port", str(PORT)]
+            with running_server(url, PORT, command=command) as base_url:
+                latencies = asyncio.run(_measure(base_url, rows, seconds, clients))
+            print(
+                f"{count:<10}{len(latencies) / seconds:>10.0f}"
+                f"{_percentile(latencies, 0.5):>10.2f}{_percentile(latencies, 0.99):>10.2f}"
+            )
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else default_workers(),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 10,
+        int(sys.argv[4]) if len(sys.argv) > 4 else 32,
+    )
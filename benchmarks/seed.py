@@ -0,0 +1,58 @@
+"""
+Seed a database with generated items for benchmarking.
+
+Usage:
+    python -m benchmarks.seed [count] [database_url]
+"""
+
+import sys
+import os
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.item import Item
+from app.crud.summary import rebuild_summary
+
+DEFAULT_COUNT = 10_000
+
+def seed_items(engine, count: int = DEFAULT_COUNT, batch_size: int = 1000) -> int:
+    """
+    Insert `count` generated items, every third one completed, and rebuild the summary.
+
+    Args:
+        engine: SQLAlchemy engine of the target database
+        count (int): Number of items to insert
+        batch_size (int): Rows per INSERT batch
+
+    Returns:
+        int: Number of items inserted
+    """
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for start in range(0, count, batch_size):
+            rows = [
+                {
+                    "title": f"Task {n}",
+                    "description": f"Generated benchmark item number {n}",
+                    "completed": n % 3 == 0,
+                }
+                for n in range(start, min(start + batch_size, count))
+            ]
+            conn.execute(insert(Item), rows)
+    # Bulk inserts bypass the CRUD layer, so recount the summary once at the end
+    with Session(engine) as db:
+        rebuild_summary(db)
+    return count
+
+if __name__ == "__main__":
+    from app.database import create_writer_engine, SQLALCHEMY_DATABASE_URL
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    url = sys.argv[2] if len(sys.argv) > 2 else SQLALCHEMY_DATABASE_URL
+    seed_items(create_writer_engine(url), count)
+    print(f"Seeded {count} items into {url}")
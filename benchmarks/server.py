@@ -0,0 +1,41 @@
+"""
+Helpers to run the application in a subprocess for benchmarks.
+"""
+
+import sys
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+
+import httpx
+
+@contextmanager
+def running_server(database_url: str, port: int, env: dict = None, command: list = None):
+    """
+    Start a server on `database_url`, wait until it answers, and stop it afterwards.
+
+    Args:
+        database_url (str): DATABASE_URL for the server
+        port (int): Port to listen on
+        env (dict): Extra environment variables
+        command (list): Server command; defaults to a single uvicorn process
+    """
+    server_env = dict(os.environ, DATABASE_URL=database_url, RATE_LIMIT_ENABLED="0", **(env or {}))
+    command = command or [
+        sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+    ]
+    server = subprocess.Popen(command, env=server_env)
+    try:
+        for _ in range(200):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/api/items/1")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("Server did not start")
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+import warnings
+
+# Suppress warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.concurrency import BoundedExecutor
+
+class TestConcurrency(unittest.TestCase):
+    """Test case for the bounded point and scan executors."""
+
+    def test_limit_is_enforced(self):
+        """Test that no more than `limit` calls run at once and waits are recorded."""
+        executor = BoundedExecutor("test", 2)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        async def scenario():
+            tasks = [asyncio.create_task(executor.run(work)) for _ in range(5)]
+            await asyncio.sleep(0.02)
+            queued = executor.statistics()["queued"]
+            await asyncio.gather(*tasks)
+            return queued
+
+        queued = asyncio.run(scenario())
+        stats = executor.statistics()
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(queued, 3)
+        self.assertEqual(stats["completed"], 5)
+        self.assertGreater(stats["wait_max_ms"], 40)
+
+        print("✅ test_limit_is_enforced: Executor bounds concurrency and records waits")
+
+    def test_saturated_scans_do_not_block_points(self):
+        """Test that a busy executor does not delay another one."""
+        scans = BoundedExecutor("scan", 1)
+        points = BoundedExecutor("point", 1)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.create_task(scans.run(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            result = await asyncio.wait_for(points.run(lambda: "done"), timeout=1)
+            release.set()
+            await asyncio.gather(*blocked)
+            return result
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+
+        print("✅ test_saturated_scans_do_not_block_points: Executors are isolated")
+
+if __name__ == "__main__":
+    try:
+        unittest.main(verbosity=0)
+        print("\n🎉 CONCURRENCY: ALL TESTS PASSED 🎉")
+    except SystemExit as e:
+        if e.code != 0:
+            print("\n❌ CONCURRENCY: TESTS FAILED ❌")
+            sys.exit(1)
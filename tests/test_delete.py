@@ -2,6 +2,7 @@ import unittest
 import sys
 import os
 import warnings
+from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -14,7 +15,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.database import Base
 from app.models.item import Item
-from app.crud.delete import delete_item
+from app.crud.delete import delete_item, restore_item, purge_deleted_items
+from app.crud.read import get_item, get_items
 
 class TestDeleteOperation(unittest.TestCase):
     """Test case for the delete operation."""
@@ -82,6 +84,55 @@ class TestDeleteOperation(unittest.TestCase):
         
         print("✅ test_delete_item_not_found: Correctly returns False for non-existent item")
 
+    def test_soft_delete_item(self):
+        """Test that a soft delete hides the item but keeps the row."""
+        result = delete_item(self.db, 1, soft=True)
+        
+        self.assertTrue(result)
+        
+        # Reads no longer see the item
+        self.assertIsNone(get_item(self.db, 1))
+        self.assertEqual([item.id for item in get_items(self.db)], [2])
+        
+        # The row is still there as a tombstone
+        tombstone = self.db.query(Item).filter(Item.id == 1).first()
+        self.assertIsNotNone(tombstone.deleted_at)
+        
+        # Deleting it again reports not found
+        self.assertFalse(delete_item(self.db, 1, soft=True))
+        
+        print("✅ test_soft_delete_item: Soft delete hides the item")
+
+    def test_restore_item(self):
+        """Test restoring a soft-deleted item."""
+        delete_item(self.db, 1, soft=True)
+        
+        restored = restore_item(self.db, 1)
+        
+        self.assertIsNotNone(restored)
+        self.assertIsNone(restored.deleted_at)
+        self.assertIsNotNone(get_item(self.db, 1))
+        
+        # Live items cannot be restored
+        self.assertIsNone(restore_item(self.db, 2))
+        
+        print("✅ test_restore_item: Soft-deleted item restored")
+
+    def test_purge_deleted_items(self):
+        """Test that the purge removes old tombstones in batches."""
+        delete_item(self.db, 1, soft=True)
+        delete_item(self.db, 2, soft=True)
+        
+        # Nothing is old enough yet
+        self.assertEqual(purge_deleted_items(self.db, datetime.utcnow() - timedelta(hours=1)), 0)
+        
+        cutoff = datetime.utcnow() + timedelta(seconds=1)
+        self.assertEqual(purge_deleted_items(self.db, cutoff, batch_size=1), 1)
+        self.assertEqual(purge_deleted_items(self.db, cutoff, batch_size=1), 1)
+        self.assertEqual(self.db.query(Item).count(), 0)
+        
+        print("✅ test_purge_deleted_items: Tombstones purged in batches")
+
 if __name__ == "__main__":
     try:
         unittest.main(verbosity=0)
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import asyncio
+import warnings
+
+# Suppress warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.events import ChangeFeed
+
+class TestChangeFeed(unittest.TestCase):
+    """Test case for the in-process item change feed."""
+
+    def setUp(self):
+        """Create a fresh feed with a small history and buffer."""
+        self.feed = ChangeFeed(history_size=3, subscriber_buffer=2)
+
+    def test_subscriber_receives_events(self):
+        """Test that published events reach a subscriber in order."""
+        async def scenario():
+            subscription, backlog = self.feed.subscribe()
+            self.feed.publish("create", {"id": 1})
+            self.feed.publish("delete", {"id": 1})
+            first = await subscription.get(1)
+            second = await subscription.get(1)
+            return backlog, first, second
+
+        backlog, first, second = asyncio.run(scenario())
+
+        self.assertEqual(backlog, [])
+        self.assertEqual((first.type, second.type), ("create", "delete"))
+        self.assertEqual(second.id, first.id + 1)
+
+        print("✅ test_subscriber_receives_events: Events delivered in order")
+
+    def test_resume_from_last_event_id(self):
+        """Test that a reconnecting client gets the events it missed."""
+        first = self.feed.publish("create", {"id": 1})
+        self.feed.publish("update", {"id": 1})
+        self.feed.publish("update", {"id": 1})
+
+        async def scenario():
+            return self.feed.subscribe(first.id)[1]
+
+        backlog = asyncio.run(scenario())
+
+        self.assertEqual([event.type for event in backlog], ["update", "update"])
+
+        print("✅ test_resume_from_last_event_id: Missed events are replayed")
+
+    def test_resume_too_far_behind(self):
+        """Test that a client older than the history is told to reset."""
+        first = self.feed.publish("create", {"id": 1})
+        for _ in range(4):
+            self.feed.publish("update", {"id": 1})
+
+        async def scenario():
+            return self.feed.subscribe(first.id)[1]
+
+        backlog = asyncio.run(scenario())
+
+        self.assertEqual([event.type for event in backlog], ["reset"])
+
+        print("✅ test_resume_too_far_behind: Client is told to reload")
+
+    def test_slow_subscriber_is_dropped(self):
+        """Test that a subscriber whose buffer overflows is disconnected."""
+        async def scenario():
+            subscription, _ = self.feed.subscribe()
+            for n in range(3):
+                self.feed.publish("create", {"id": n})
+            await asyncio.sleep(0)
+            return await subscription.get(1)
+
+        self.assertIsNone(asyncio.run(scenario()))
+
+        print("✅ test_slow_subscriber_is_dropped: Overflowing subscriber is dropped")
+
+if __name__ == "__main__":
+    try:
+        unittest.main(verbosity=0)
+        print("\n🎉 CHANGE FEED: ALL TESTS PASSED 🎉")
+    except SystemExit as e:
+        if e.code != 0:
+            print("\n❌ CHANGE FEED: TESTS FAILED ❌")
+            sys.exit(1)
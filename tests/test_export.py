@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import asyncio
+import importlib.util
+import warnings
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Suppress warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import Base
+from app.models.item import ArchivedItem, Item
+from app.export import arrow_stream
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+class TestExport(unittest.TestCase):
+    """Test case for the Arrow IPC export."""
+
+    def setUp(self):
+        """Set up a new test database for each test."""
+        # Export batches are fetched from worker threads, so share one connection
+        self.engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.db = TestingSessionLocal()
+
+        self.db.add_all([Item(id=n, title=f"Item {n}", completed=n % 2 == 0) for n in range(1, 11)])
+        self.db.add(Item(id=11, title="Deleted", deleted_at=datetime.utcnow()))
+        self.db.add(ArchivedItem(id=12, title="Archived", completed=True, archived_at=datetime.utcnow()))
+        self.db.commit()
+
+    def tearDown(self):
+        """Clean up after each test."""
+        Base.metadata.drop_all(self.engine)
+        self.db.close()
+
+    def _export(self, fields, **options):
+        import pyarrow as pa
+
+        async def collect():
+            chunks = [chunk async for chunk in arrow_stream(self.db, fields, **options)]
+            return chunks
+
+        chunks = asyncio.run(collect())
+        return chunks, pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    def test_export_in_batches(self):
+        """Test that rows are streamed as several record batches."""
+        chunks, table = self._export(["id", "title", "completed"], batch_size=4)
+
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(table.column("id").to_pylist()[:3], [1, 2, 3])
+        self.assertEqual(table.column("completed").to_pylist()[:2], [False, True])
+        # Three batches of at most 4 rows, then the end of the stream
+        self.assertGreaterEqual(len(chunks), 4)
+
+        print("✅ test_export_in_batches: Items stream as Arrow record batches")
+
+    def test_projection_and_filters(self):
+        """Test column projection, paging and archived items."""
+        _, table = self._export(["completed"], skip=2, limit=3)
+        self.assertEqual(table.schema.names, ["completed"])
+        self.assertEqual(table.column("completed").to_pylist(), [False, True, False])
+
+        _, merged = self._export(["id"], skip=8, include_archived=True)
+        self.assertEqual(merged.column("id").to_pylist(), [9, 10, 12])
+
+        _, empty = self._export(["id"], limit=0)
+        self.assertEqual(empty.num_rows, 0)
+
+        print("✅ test_projection_and_filters: Fields, skip and limit are applied")
+
+if __name__ == "__main__":
+    try:
+        unittest.main(verbosity=0)
+        print("\n🎉 EXPORT: ALL TESTS PASSED 🎉")
+    except SystemExit as e:
+        if e.code != 0:
+            print("\n❌ EXPORT: TESTS FAILED ❌")
+            sys.exit(1)
@@ -193,6 +193,48 @@ class SimpleIntegrationTest(unittest.TestCase):
         
         print("✅ Full CRUD workflow works via API")
 
+    def test_7_conditional_update(self):
+        """Test If-Match updates and 412 on a stale version."""
+        item_id = self.test_1_create_item()
+
+        read_response = self.session.get(f"{BASE_URL}/api/items/{item_id}")
+        etag = read_response.headers["ETag"]
+
+        # PATCH with the current ETag succeeds and returns the next one
+        patch_response = self.session.patch(
+            f"{BASE_URL}/api/items/{item_id}", json={"completed": True}, headers={"If-Match": etag}
+        )
+        self.assertEqual(patch_response.status_code, 200)
+        self.assertEqual(patch_response.json()["title"], "Test Item")
+        self.assertNotEqual(patch_response.headers["ETag"], etag)
+
+        # Reusing the old ETag fails without changing the item
+        stale_response = self.session.put(
+            f"{BASE_URL}/api/items/{item_id}", json={"title": "Lost update"}, headers={"If-Match": etag}
+        )
+        self.assertEqual(stale_response.status_code, 412)
+        self.assertEqual(stale_response.headers["ETag"], patch_response.headers["ETag"])
+        self.assertEqual(self.session.get(f"{BASE_URL}/api/items/{item_id}").json()["title"], "Test Item")
+
+        # If-Match compares strongly, so a weak tag never matches
+        weak_response = self.session.patch(
+            f"{BASE_URL}/api/items/{item_id}", json={"title": "Weak"}, headers={"If-Match": f"W/{etag}"}
+        )
+        self.assertEqual(weak_response.status_code, 412)
+
+        print("✅ Conditional updates work via API")
+
+    def test_put_replaces_item(self):
+        """Test that PUT resets the fields it leaves out."""
+        item_id = self.test_1_create_item()
+
+        response = self.session.put(f"{BASE_URL}/api/items/{item_id}", json={"title": "Replaced"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["description"], None)
+        self.assertEqual(response.json()["completed"], False)
+
+        print("✅ PUT replaces the whole item via API")
+
 if __name__ == "__main__":
     print("\n🚀 Running simple integration tests against the API server")
     print("⚠️  Make sure the app is running with 'uvicorn app.main:app --reload'\n")
@@ -14,7 +14,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.database import Base
 from app.models.item import Item
-from app.crud.read import get_item, get_items
+from app.crud.read import get_item, get_items, get_items_by_ids, MAX_IN_CLAUSE_PARAMS
+from app.crud.delete import delete_item
 
 class TestReadOperation(unittest.TestCase):
     """Test case for the read operations."""
@@ -111,6 +112,44 @@ class TestReadOperation(unittest.TestCase):
         
         print("✅ test_get_items_pagination: Pagination works correctly")
 
+    def test_get_items_after_id(self):
+        """Test keyset pagination continuing from the last id of a page."""
+        first_page = get_items(self.db, limit=2)
+        self.assertEqual([item.id for item in first_page], [1, 2])
+
+        # Deleting a row already shown must not shift the next page
+        delete_item(self.db, 1)
+        next_page = get_items(self.db, limit=2, after_id=first_page[-1].id)
+        self.assertEqual([item.id for item in next_page], [3])
+        self.assertEqual(get_items(self.db, after_id=3), [])
+
+        print("✅ test_get_items_after_id: Keyset pagination continues after the last id")
+
+    def test_get_items_by_ids(self):
+        """Test fetching several items by ID in request order."""
+        # Ask for existing, missing and repeated ids out of order
+        items = get_items_by_ids(self.db, [3, 999, 1, 3])
+        
+        # Check that results follow the request order with None for misses
+        self.assertEqual(len(items), 4)
+        self.assertEqual(items[0].id, 3)
+        self.assertIsNone(items[1])
+        self.assertEqual(items[2].id, 1)
+        self.assertEqual(items[3].id, 3)
+        
+        print("✅ test_get_items_by_ids: Batch read keeps request order")
+
+    def test_get_items_by_ids_chunked(self):
+        """Test that id lists longer than one IN clause are chunked."""
+        item_ids = list(range(1, MAX_IN_CLAUSE_PARAMS * 2 + 2))
+        items = get_items_by_ids(self.db, item_ids)
+        
+        # Only the three seeded items exist
+        self.assertEqual(len(items), len(item_ids))
+        self.assertEqual([item.id for item in items if item is not None], [1, 2, 3])
+        
+        print("✅ test_get_items_by_ids_chunked: Long id lists are chunked")
+
 if __name__ == "__main__":
     try:
         unittest.main(verbosity=0)
@@ -0,0 +1,214 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import warnings
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+# Suppress warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import Base, migrate_schema
+from app.models.item import ArchivedItem, Item
+from app.models.summary import ItemSummary
+from app.schemas.item import ItemCreate, ItemPatch
+from app.crud.archive import archive_completed_items, unarchive_item
+from app.crud.create import create_item
+from app.crud.delete import delete_item
+from app.crud.read import get_item, get_items, get_items_by_ids
+from app.crud.summary import get_summary, reconcile_summary
+from app.crud.update import update_item
+from app.tenancy import DEFAULT_TENANT, TenantEnginePool, resolve_tenant
+
+class TestTenantScoping(unittest.TestCase):
+    """Test case for automatic tenant scoping of the CRUD functions."""
+
+    def setUp(self):
+        """Set up one database shared by two tenants."""
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.acme = Session(info={"tenant_id": "acme"})
+        self.beta = Session(info={"tenant_id": "beta"})
+        self.unscoped = Session()
+
+        self.acme_item = create_item(self.acme, ItemCreate(title="Acme item", completed=True))
+        self.beta_item = create_item(self.beta, ItemCreate(title="Beta item"))
+
+    def tearDown(self):
+        """Clean up after each test."""
+        for db in (self.acme, self.beta, self.unscoped):
+            db.close()
+        Base.metadata.drop_all(self.engine)
+
+    def test_new_items_get_the_session_tenant(self):
+        """Test that created items are stamped with the session's tenant."""
+        self.assertEqual(self.acme_item.tenant_id, "acme")
+        self.assertEqual(self.beta_item.tenant_id, "beta")
+
+        print("✅ test_new_items_get_the_session_tenant: New rows belong to the session's tenant")
+
+    def test_reads_are_scoped(self):
+        """Test that a tenant only reads its own items."""
+        self.assertEqual([item.title for item in get_items(self.acme)], ["Acme item"])
+        self.assertIsNone(get_item(self.acme, self.beta_item.id))
+        self.assertEqual(get_items_by_ids(self.beta, [self.acme_item.id, self.beta_item.id])[0], None)
+        self.assertEqual(len(get_items(self.unscoped)), 2)
+
+        print("✅ test_reads_are_scoped: Tenants never see each other's items")
+
+    def test_writes_are_scoped(self):
+        """Test that a tenant cannot change or delete another tenant's items."""
+        self.assertIsNone(update_item(self.acme, self.beta_item.id, ItemPatch(title="Taken over")))
+        self.assertFalse(delete_item(self.acme, self.beta_item.id))
+        self.assertEqual(get_item(self.beta, self.beta_item.id).title, "Beta item")
+
+        print("✅ test_writes_are_scoped: Tenants cannot modify each other's items")
+
+    def test_archive_is_scoped(self):
+        """Test that items keep their tenant when archived and brought back."""
+        cutoff = datetime.utcnow() + timedelta(seconds=1)
+        self.assertEqual(archive_completed_items(self.unscoped, cutoff), 1)
+
+        archived = self.unscoped.query(ArchivedItem).one()
+        self.assertEqual(archived.tenant_id, "acme")
+        self.assertIsNone(get_item(self.beta, self.acme_item.id))
+        self.assertFalse(delete_item(self.beta, self.acme_item.id))
+        self.assertEqual(get_item(self.acme, self.acme_item.id).title, "Acme item")
+        self.assertEqual(
+            [item.id for item in get_items(self.acme, include_archived=True)], [self.acme_item.id]
+        )
+        self.assertEqual(get_summary(self.acme)["*"], (1, 1))
+        self.assertEqual(get_summary(self.beta)["*"], (1, 0))
+
+        # Updating the archived item moves it back to `items` under its tenant
+        self.assertIsNone(update_item(self.beta, self.acme_item.id, ItemPatch(title="Taken over")))
+        self.assertTrue(unarchive_item(self.acme, self.acme_item.id))
+        self.acme.commit()
+        restored = self.unscoped.query(Item).filter(Item.id == self.acme_item.id).one()
+        self.assertEqual(restored.tenant_id, "acme")
+        self.assertEqual(self.unscoped.query(ArchivedItem).count(), 0)
+
+        print("✅ test_archive_is_scoped: Archived items stay with their tenant")
+
+    def test_summary_per_tenant(self):
+        """Test that each tenant has its own counts."""
+        self.assertEqual(get_summary(self.acme)["*"], (1, 1))
+        self.assertEqual(get_summary(self.beta)["*"], (1, 0))
+        self.assertEqual(reconcile_summary(self.unscoped), 0)
+
+        self.unscoped.query(ItemSummary).delete()
+        self.unscoped.commit()
+        self.assertEqual(reconcile_summary(self.unscoped), 2)
+        self.assertEqual(get_summary(self.beta)["*"], (1, 0))
+
+        print("✅ test_summary_per_tenant: Summary counts are kept and recounted per tenant")
+
+    def test_resolve_tenant(self):
+        """Test tenant id validation."""
+        self.assertEqual(resolve_tenant(None), DEFAULT_TENANT)
+        self.assertEqual(resolve_tenant("team-7_a"), "team-7_a")
+        for bad in ("../etc", "a b", "x" * 65):
+            with self.assertRaises(HTTPException):
+                resolve_tenant(bad)
+
+        print("✅ test_resolve_tenant: Malformed tenant ids are rejected")
+
+class TestTenantEnginePool(unittest.TestCase):
+    """Test case for the LRU pool of per-tenant handles."""
+
+    def test_least_recently_used_is_closed(self):
+        """Test that the least recently used tenant is evicted when the pool is full."""
+        closed = []
+        pool = TenantEnginePool(lambda tenant: f"handle-{tenant}", closed.append, size=2)
+
+        self.assertEqual(pool.get("a"), "handle-a")
+        pool.get("b")
+        pool.get("a")
+        pool.get("c")
+
+        self.assertEqual(closed, ["handle-b"])
+        self.assertEqual(sorted(pool.open_tenants()), ["a", "c"])
+        self.assertEqual(pool.statistics()["evicted"], 1)
+
+        print("✅ test_least_recently_used_is_closed: LRU tenant engines are disposed")
+
+    def test_slow_open_blocks_only_its_tenant(self):
+        """Test that opening one tenant holds up neither other tenants nor a second open."""
+        opening = threading.Event()
+        finish = threading.Event()
+        opened = []
+
+        def open_tenant(tenant):
+            opened.append(tenant)
+            if tenant == "slow":
+                opening.set()
+                finish.wait(5)
+            return f"handle-{tenant}"
+
+        pool = TenantEnginePool(open_tenant, lambda handle: None, size=4)
+        pool.get("fast")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.get("slow"))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        opening.wait(5)
+
+        # A cached tenant is served while "slow" is still being opened
+        self.assertEqual(pool.get("fast"), "handle-fast")
+        finish.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["handle-slow", "handle-slow"])
+        self.assertEqual(opened, ["fast", "slow"])
+
+        print("✅ test_slow_open_blocks_only_its_tenant: Tenants are opened under their own lock")
+
+class TestTenantMigration(unittest.TestCase):
+    """Test case for upgrading a database created before tenants existed."""
+
+    def test_migrate_adds_tenant(self):
+        """Test that old rows join the default tenant and old indexes are replaced."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = create_engine(f"sqlite:///{tmpdir}/items.db")
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE TABLE items (id INTEGER PRIMARY KEY, title VARCHAR, description VARCHAR, completed BOOLEAN)"
+                ))
+                conn.execute(text("CREATE INDEX ix_items_title ON items (title)"))
+                conn.execute(text(
+                    "CREATE TABLE item_summary (bucket VARCHAR PRIMARY KEY, total INTEGER, completed INTEGER)"
+                ))
+                conn.execute(text("INSERT INTO items (id, title, completed) VALUES (1, 'Old', 0)"))
+
+            Base.metadata.create_all(engine)
+            recreated = migrate_schema(engine)
+
+            self.assertEqual(recreated, {"item_summary"})
+            indexes = {index["name"] for index in inspect(engine).get_indexes("items")}
+            self.assertNotIn("ix_items_title", indexes)
+            self.assertIn("ix_items_tenant_title", indexes)
+            db = sessionmaker(bind=engine)(info={"tenant_id": DEFAULT_TENANT})
+            self.assertEqual(db.query(Item).one().tenant_id, DEFAULT_TENANT)
+            db.close()
+            engine.dispose()
+
+        print("✅ test_migrate_adds_tenant: Existing rows move to the default tenant")
+
+if __name__ == "__main__":
+    try:
+        unittest.main(verbosity=0)
+        print("\n🎉 TENANCY: ALL TESTS PASSED 🎉")
+    except SystemExit as e:
+        if e.code != 0:
+            print("\n❌ TENANCY: TESTS FAILED ❌")
+            sys.exit(1)
@@ -12,10 +12,11 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Add the parent directory to the sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import Base
+from app.database import Base, SESSION_OPTIONS
 from app.models.item import Item
-from app.schemas.item import ItemCreate
-from app.crud.update import update_item
+from app.schemas.item import ItemCreate, ItemPatch, ItemUpdate
+from app.crud.update import VersionConflict, update_item
+from app.crud.summary import TOTAL_BUCKET, get_summary
 
 class TestUpdateOperation(unittest.TestCase):
     """Test case for the update operation."""
@@ -92,6 +93,17 @@ class TestUpdateOperation(unittest.TestCase):
         
         print("✅ test_update_item_partial: Partial update works correctly")
 
+    def test_replace_resets_omitted_fields(self):
+        """Test that a full update resets fields it leaves out, and a patch keeps them."""
+        patched = update_item(self.db, 1, ItemPatch(title="Patched"))
+        self.assertEqual(patched.description, "Original Description")
+
+        replaced = update_item(self.db, 1, ItemUpdate(title="Replaced"))
+        self.assertEqual(replaced.description, None)
+        self.assertEqual(replaced.completed, False)
+
+        print("✅ test_replace_resets_omitted_fields: PUT replaces, PATCH merges")
+
     def test_update_item_not_found(self):
         """Test updating a non-existent item."""
         # Create new data
@@ -109,6 +121,55 @@ class TestUpdateOperation(unittest.TestCase):
         
         print("✅ test_update_item_not_found: Correctly returns None for non-existent item")
 
+    def test_update_item_increments_version(self):
+        """Test that each update moves the item to the next version."""
+        self.assertEqual(self.test_item.version, 1)
+
+        updated_item = update_item(self.db, 1, ItemPatch(completed=True))
+        self.assertEqual(updated_item.version, 2)
+        self.assertEqual(updated_item.title, "Original Title")
+
+        updated_item = update_item(self.db, 1, ItemPatch(title="Again"), expected_version=2)
+        self.assertEqual(updated_item.version, 3)
+        self.assertEqual(updated_item.title, "Again")
+
+        print("✅ test_update_item_increments_version: Version increases on every update")
+
+    def test_update_item_version_conflict(self):
+        """Test that an update based on an old version is rejected."""
+        update_item(self.db, 1, ItemPatch(title="First writer"), expected_version=1)
+
+        with self.assertRaises(VersionConflict) as ctx:
+            update_item(self.db, 1, ItemPatch(title="Second writer"), expected_version=1)
+        self.assertEqual(ctx.exception.current_version, 2)
+
+        db_item = self.db.query(Item).filter(Item.id == 1).first()
+        self.db.refresh(db_item)
+        self.assertEqual(db_item.title, "First writer")
+        self.assertEqual(db_item.version, 2)
+
+        print("✅ test_update_item_version_conflict: Stale updates raise VersionConflict")
+
+    def test_update_item_without_version_after_other_write(self):
+        """Test that an update without an expected version applies over a newer row."""
+        db = sessionmaker(bind=self.engine, **SESSION_OPTIONS)()
+        stale = db.get(Item, 1)
+        other = sessionmaker(bind=self.engine, **SESSION_OPTIONS)()
+        update_item(other, 1, ItemPatch(title="Other writer", completed=True))
+        other.close()
+
+        # This session still holds the item as it was at version 1
+        updated_item = update_item(db, 1, ItemPatch(completed=False))
+        self.assertIs(updated_item, stale)
+        self.assertEqual(updated_item.version, 3)
+        self.assertEqual(updated_item.title, "Other writer")
+
+        # The summary delta started from the row's values, not the stale copy
+        self.assertEqual(get_summary(db, prefixes=[])[TOTAL_BUCKET][1], 0)
+        db.close()
+
+        print("✅ test_update_item_without_version_after_other_write: Unconditional updates never conflict")
+
 if __name__ == "__main__":
     try:
         unittest.main(verbosity=0)
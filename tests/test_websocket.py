@@ -0,0 +1,184 @@
+import asyncio
+import unittest
+import sys
+import os
+import threading
+import time
+import warnings
+from functools import partial
+from unittest import mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.websockets import WebSocketDisconnect
+
+# Suppress warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Add the parent directory to the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import Base, SESSION_OPTIONS
+import app.routes.websocket as websocket_routes
+
+class TestItemsWebSocket(unittest.TestCase):
+    """Test case for pipelined CRUD over /ws/items."""
+
+    def setUp(self):
+        """Serve the WebSocket route from a minimal app on an in-memory database."""
+        self.engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        Session = sessionmaker(bind=self.engine, **SESSION_OPTIONS)
+
+        def sessionmakers(tenant):
+            factory = partial(Session, info={"tenant_id": tenant})
+            return factory, factory
+
+        patcher = mock.patch.object(websocket_routes, "tenant_sessionmakers", sessionmakers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+        app.include_router(websocket_routes.router)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        """Clean up after each test."""
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _connect(self, tenant="acme"):
+        return self.client.websocket_connect("/ws/items", headers={"X-Tenant-ID": tenant})
+
+    def test_crud_round_trip(self):
+        """Test create, get, update and delete over one connection."""
+        with self._connect() as ws:
+            ws.send_json({"id": 1, "method": "create", "params": {"item": {"title": "Socket item"}}})
+            created = ws.receive_json()
+            self.assertEqual(created["id"], 1)
+            item_id = created["result"]["id"]
+
+            ws.send_json({"id": 2, "method": "update", "params": {
+                "item_id": item_id, "item": {"title": "Renamed"}, "version": 1,
+            }})
+            self.assertEqual(ws.receive_json()["result"]["version"], 2)
+
+            ws.send_json({"id": 3, "method": "delete", "params": {"item_id": item_id}})
+            self.assertEqual(ws.receive_json(), {"id": 3, "result": None})
+
+        print("✅ test_crud_round_trip: Items are created, updated and deleted over the socket")
+
+    def test_responses_out_of_order(self):
+        """Test that a fast request is answered before a slow one sent earlier."""
+        dispatch = websocket_routes._dispatch
+
+        def slow_dispatch(method, params, use_writer, tenant):
+            if params.get("slow"):
+                time.sleep(0.3)
+            return dispatch(method, params, use_writer, tenant)
+
+        with mock.patch.object(websocket_routes, "_dispatch", slow_dispatch), self._connect() as ws:
+            ws.send_json({"id": "slow", "method": "create", "params": {"slow": True, "item": {"title": "A"}}})
+            ws.send_json({"id": "fast", "method": "create", "params": {"item": {"title": "B"}}})
+
+            self.assertEqual([ws.receive_json()["id"], ws.receive_json()["id"]], ["fast", "slow"])
+
+        print("✅ test_responses_out_of_order: Responses carry their request id and arrive as ready")
+
+    def test_error_codes(self):
+        """Test the error code of each kind of failed request."""
+        with self._connect() as ws:
+            ws.send_json({"id": 1, "method": "create", "params": {"item": {"title": "Item"}}})
+            item_id = ws.receive_json()["result"]["id"]
+
+            requests = {
+                400: [
+                    "not json",
+                    {"id": 2, "method": "rename", "params": {}},
+                    {"id": 3, "method": "get", "params": {"item_id": "1"}},
+                ],
+                404: [{"id": 4, "method": "get", "params": {"item_id": 999}}],
+                412: [{"id": 5, "method": "update", "params": {
+                    "item_id": item_id, "item": {"title": "Stale"}, "version": 7,
+                }}],
+                422: [{"id": 6, "method": "create", "params": {"item": {"title": 5}}}],
+            }
+            for code, messages in requests.items():
+                for message in messages:
+                    if isinstance(message, str):
+                        ws.send_text(message)
+                    else:
+                        ws.send_json(message)
+                    self.assertEqual(ws.receive_json()["error"]["code"], code, message)
+
+            # A binary frame gets an error and the connection stays usable
+            ws.send_bytes(b"\x00\x01")
+            self.assertEqual(ws.receive_json()["error"]["code"], 400)
+            ws.send_json({"id": 7, "method": "get", "params": {"item_id": item_id}})
+            self.assertEqual(ws.receive_json()["result"]["title"], "Item")
+
+        print("✅ test_error_codes: Failed requests get 400/404/412/422 errors")
+
+    def test_in_flight_cap(self):
+        """Test that no more than MAX_IN_FLIGHT requests run before responses are sent."""
+        sending = threading.Event()
+        started = []
+
+        def counting_dispatch(method, params, use_writer, tenant):
+            started.append(params["item_id"])
+            return None
+
+        original_send = websocket_routes._Connection.send
+
+        async def held_send(connection, message):
+            # Responses cannot go out until the test lets them
+            while not sending.is_set():
+                await asyncio.sleep(0.01)
+            await original_send(connection, message)
+
+        with mock.patch.object(websocket_routes, "MAX_IN_FLIGHT", 2), \
+                mock.patch.object(websocket_routes, "_dispatch", counting_dispatch), \
+                mock.patch.object(websocket_routes._Connection, "send", held_send), \
+                self._connect() as ws:
+            for n in range(6):
+                ws.send_json({"id": n, "method": "get", "params": {"item_id": n}})
+            try:
+                time.sleep(0.3)
+                self.assertEqual(len(started), 2)
+            finally:
+                sending.set()
+            self.assertEqual(sorted(ws.receive_json()["id"] for _ in range(6)), list(range(6)))
+
+        print("✅ test_in_flight_cap: Unsent responses hold their slots")
+
+    def test_tenant_scoping(self):
+        """Test that a connection only sees its tenant's items."""
+        with self._connect("acme") as ws:
+            ws.send_json({"id": 1, "method": "create", "params": {"item": {"title": "Acme item"}}})
+            item_id = ws.receive_json()["result"]["id"]
+
+        with self._connect("beta") as ws:
+            for method in ("get", "delete"):
+                ws.send_json({"id": 2, "method": method, "params": {"item_id": item_id}})
+                self.assertEqual(ws.receive_json()["error"]["code"], 404)
+
+        with self.assertRaises(WebSocketDisconnect) as raised:
+            with self._connect("../etc"):
+                pass
+        self.assertEqual(raised.exception.code, 1008)
+
+        print("✅ test_tenant_scoping: Connections are scoped to the handshake's tenant")
+
+if __name__ == "__main__":
+    try:
+        unittest.main(verbosity=0)
+        print("\n🎉 WEBSOCKET: ALL TESTS PASSED 🎉")
+    except SystemExit as e:
+        if e.code != 0:
+            print("\n❌ WEBSOCKET: TESTS FAILED ❌")
+            sys.exit(1)